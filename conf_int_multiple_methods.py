@@ -3,7 +3,6 @@ import math
 import numpy as np
 import matplotlib.pyplot as plt
 import streamlit as st
-from scipy.stats import norm
 
 from utils import *
 
@@ -170,6 +169,6 @@ with st.expander("Sample size planner (margin of error)"):
         p_star = st.number_input("Planning value p*", min_value=0.0, max_value=1.0, value=float(phat), step=0.01)
 
     alpha2 = 1 - conf2 / 100
-    z2 = norm.ppf(1 - alpha2 / 2)
+    z2 = critical_value(alpha2, "two")
     n_req = math.ceil((z2**2) * p_star * (1 - p_star) / (m**2))
     st.info(f"Required sample size: **n ≥ {n_req}**")
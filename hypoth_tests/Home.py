@@ -1,4 +1,5 @@
 # Home.py
+import os
 import time
 import secrets
 import streamlit as st
@@ -9,6 +10,13 @@ st.set_page_config(
     layout="centered"
 )
 
+# hidden profiling view: Home?admin=<MA206_ADMIN_TOKEN>
+admin_token = os.environ.get("MA206_ADMIN_TOKEN")
+if admin_token and secrets.compare_digest(st.query_params.get("admin", "").encode(), admin_token.encode()):
+    from utils import profile_dashboard
+    profile_dashboard()
+    st.stop()
+
 st.markdown(
     """
     <style>
@@ -0,0 +1,233 @@
+# benchmarks/bench_pages.py
+"""Headless per-page latency benchmark for the Streamlit app.
+
+Each page (Home.py and everything in pages/) is driven with Streamlit's
+AppTest in its own fresh interpreter, so caches start empty and peak RSS is
+per page. The first run is the cold start; the page's SCRIPT of widget
+changes is then replayed `--rounds` times and every rerun is a warm sample.
+
+    python hypoth_tests/benchmarks/bench_pages.py --out bench.json
+    python hypoth_tests/benchmarks/bench_pages.py --pages 03 07 --cold 5
+    python hypoth_tests/benchmarks/bench_pages.py --out new.json --compare bench.json
+
+Reported per page: cold and warm latency percentiles (seconds), peak RSS (MiB),
+matplotlib figures created on the cold run and per warm rerun, and any page
+exceptions. --compare prints warm/cold p50 ratios against an earlier file and
+exits 1 if any page is slower than --tolerance allows.
+
+Play on page 03 runs its frame loop with time.sleep(speed), so the script
+first drops the speed to its minimum; those sleeps still count toward the
+Play reruns.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_TAG = "BENCH_RESULT "
+
+RIGHT, LEFT, TWO = "One-Sided (Right-Tailed, >)", "One-Sided (Left-Tailed, <)", "Two-Sided (≠)"
+
+# (widget kind, label or key, value) steps; each script ends on the page defaults
+# so rounds replay from the same state. Buttons take value None (click).
+_TEST_PAGE = [
+    ("slider", "α (%)", 1), ("slider", "α (%)", 10),
+    ("radio", "Choose test type:", LEFT), ("radio", "Choose test type:", TWO),
+    ("radio", "Choose test type:", RIGHT), ("slider", "α (%)", 5),
+]
+_CI_PAGE = [
+    ("slider", "Confidence level (%)", 90), ("slider", "Confidence level (%)", 99),
+    ("slider", "Confidence level (%)", 95),
+]
+SCRIPTS = {
+    "Home.py": [],
+    "pages/01_One_Proportion_Z_Test.py": _TEST_PAGE + [
+        ("number_input", "Sample size (n)", 400), ("number_input", "Sample size (n)", 200)],
+    "pages/02_One_Sample_t_Test.py": _TEST_PAGE + [
+        ("number_input", "Sample size (n)", 40), ("number_input", "Sample size (n)", 20)],
+    "pages/03_Intuition_on_Confidence_Intervals.py": [
+        ("slider", "Animation speed (sec/frame)", 0.02),
+        ("slider", "Sample size (n)", 50), ("slider", "Confidence level (%)", 90),
+        ("button", "▶️ Play", None),
+        ("slider", "Number of intervals", 60), ("button", "▶️ Play", None),
+        ("checkbox", "Play in browser", True), ("button", "▶️ Play", None),
+        ("checkbox", "Play in browser", False),
+        ("radio", "Sampling engine", "Analytic (normal theory)"),
+        ("radio", "Sampling engine", "Resample population"),
+        ("slider", "Sample size (n)", 30), ("slider", "Confidence level (%)", 95),
+        ("slider", "Number of intervals", 30), ("slider", "Animation speed (sec/frame)", 0.12),
+    ],
+    "pages/04_One_Proportion_Confidence_Intervals.py": _CI_PAGE + [
+        ("slider", "cov_n", 500), ("slider", "cov_n", 100)],
+    "pages/05_One_Sample_Confidence_Interval.py": _CI_PAGE + [
+        ("number_input", "Sample size (n)", 50), ("number_input", "Sample size (n)", 25)],
+    "pages/06_Two_Proportion_Z_Test.py": _TEST_PAGE,
+    "pages/07_Two_Sample_t_Test.py": _TEST_PAGE + [
+        ("number_input", "Sample size group 1 (n₁)", 30), ("number_input", "Sample size group 1 (n₁)", 15)],
+    "pages/08_Difference_in_Proportions_CI.py": _CI_PAGE,
+    "pages/09_Difference_in_Means_CI.py": _CI_PAGE + [
+        ("number_input", "Sample size group 1 (n₁)", 30), ("number_input", "Sample size group 1 (n₁)", 15)],
+    "pages/10_Paired_Data.py": _TEST_PAGE + [
+        ("slider", "ci_conf", 90), ("slider", "ci_conf", 95)],
+}
+
+def _widget(at, kind, name):
+    for w in getattr(at, kind):
+        if w.key == name or w.label == name:
+            return w
+    raise LookupError(f"no {kind} labelled or keyed {name!r}")
+
+def _apply(at, kind, name, value):
+    w = _widget(at, kind, name)
+    return w.click() if kind == "button" else w.set_value(value)
+
+def run_worker(page, rounds, timeout):
+    """Benchmark one page in this process and print its result line."""
+    import resource
+    from matplotlib.figure import Figure
+    from streamlit.testing.v1 import AppTest
+
+    figures = [0]
+    init = Figure.__init__
+    def counting_init(self, *args, **kwargs):
+        figures[0] += 1
+        init(self, *args, **kwargs)
+    Figure.__init__ = counting_init
+
+    sys.path.insert(0, APP_DIR)
+    os.chdir(APP_DIR)
+    at = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=timeout)
+    t0 = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - t0
+    cold_figures = figures[0]
+    exceptions = [e.value for e in at.exception]
+
+    steps = SCRIPTS.get(page) or [None]  # a page with no widgets just reruns
+    warm, warm_figures = [], 0
+    for _ in range(rounds):
+        for step in steps:
+            figures[0] = 0
+            t0 = time.perf_counter()
+            (at if step is None else _apply(at, *step)).run()
+            warm.append(time.perf_counter() - t0)
+            warm_figures += figures[0]
+            exceptions += [e.value for e in at.exception]
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 2**20 if sys.platform == "darwin" else rss / 2**10  # bytes on macOS, KiB on Linux
+    print(RESULT_TAG + json.dumps(dict(
+        cold=cold, warm=warm, peak_rss_mb=rss_mb, cold_figures=cold_figures,
+        warm_figures=warm_figures / max(1, len(warm)), exceptions=sorted(set(map(str, exceptions))),
+    )), flush=True)
+
+def _percentiles(samples):
+    a = np.asarray(samples, dtype=float)
+    if a.size == 0:
+        return None
+    p50, p90, p99 = np.percentile(a, [50, 90, 99])
+    return dict(n=int(a.size), p50=p50, p90=p90, p99=p99, max=float(a.max()), mean=float(a.mean()))
+
+def bench_page(page, cold_runs, rounds, timeout):
+    """Run `cold_runs` fresh worker processes for one page and pool their samples."""
+    runs = []
+    for _ in range(cold_runs):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", page,
+             "--rounds", str(rounds), "--timeout", str(timeout)],
+            capture_output=True, text=True,
+        )
+        lines = [l for l in proc.stdout.splitlines() if l.startswith(RESULT_TAG)]
+        if proc.returncode or not lines:
+            raise RuntimeError(f"{page}: worker failed\n{proc.stderr[-2000:]}")
+        runs.append(json.loads(lines[-1][len(RESULT_TAG):]))
+    return dict(
+        cold_s=_percentiles([r["cold"] for r in runs]),
+        warm_s=_percentiles([w for r in runs for w in r["warm"]]),
+        peak_rss_mb=max(r["peak_rss_mb"] for r in runs),
+        figures=dict(cold=max(r["cold_figures"] for r in runs),
+                     warm_per_rerun=float(np.mean([r["warm_figures"] for r in runs]))),
+        exceptions=sorted({e for r in runs for e in r["exceptions"]}),
+    )
+
+def _meta(args):
+    import streamlit
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=APP_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return dict(
+        commit=commit, timestamp=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(), streamlit=streamlit.__version__,
+        platform=platform.platform(), cpu_count=os.cpu_count(),
+        cold_runs=args.cold, rounds=args.rounds,
+    )
+
+def compare(results, baseline, tolerance):
+    """Print p50 ratios against `baseline`; return the pages slower than `tolerance`."""
+    slow = []
+    print(f"{'page':50s} {'cold p50':>14s} {'warm p50':>14s}")
+    for page, new in results["pages"].items():
+        old = baseline.get("pages", {}).get(page)
+        if old is None:
+            continue
+        cells = []
+        for phase in ("cold_s", "warm_s"):
+            if not (new[phase] and old[phase]):
+                cells.append(f"{'-':>14s}")
+                continue
+            ratio = new[phase]["p50"] / old[phase]["p50"]
+            cells.append(f"{ratio:13.2f}x")
+            if ratio > tolerance:
+                slow.append((page, phase, ratio))
+        print(f"{page:50s} {cells[0]} {cells[1]}")
+    return slow
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", nargs="*", help="substrings selecting pages (default: all)")
+    ap.add_argument("--cold", type=int, default=3, help="fresh processes per page")
+    ap.add_argument("--rounds", type=int, default=3, help="replays of each page's script per process")
+    ap.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per run (s)")
+    ap.add_argument("--out", default="bench_pages.json", help="where to write the results")
+    ap.add_argument("--compare", help="earlier results file to compare against")
+    ap.add_argument("--tolerance", type=float, default=1.25, help="p50 ratio counted as a regression")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.rounds, args.timeout)
+        return 0
+
+    pages = [p for p in SCRIPTS if not args.pages or any(s in p for s in args.pages)]
+    results = dict(meta=_meta(args), pages={})
+    for page in pages:
+        res = results["pages"][page] = bench_page(page, args.cold, args.rounds, args.timeout)
+        warm = res["warm_s"]
+        print(f"{page:50s} cold p50 {res['cold_s']['p50']:6.2f}s  "
+              f"warm p50 {warm['p50']:6.3f}s p90 {warm['p90']:6.3f}s  "
+              f"rss {res['peak_rss_mb']:6.0f} MiB  figs {res['figures']['cold']}/{res['figures']['warm_per_rerun']:.1f}"
+              + (f"  EXCEPTIONS {len(res['exceptions'])}" if res["exceptions"] else ""), flush=True)
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            slow = compare(results, json.load(f), args.tolerance)
+        for page, phase, ratio in slow:
+            print(f"REGRESSION {page} {phase} p50 x{ratio:.2f}")
+        return 1 if slow else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+# datastore.py
+"""Columnar, memory-mapped cache of the repository's CSV datasets.
+
+Each CSV is parsed once (pandas) into one .npy file per column plus a
+meta.json under CACHE_DIR/datasets/<name>-<fingerprint>/. Text and boolean
+columns become integer category codes (-1 for missing) with their labels in
+meta.json; numeric columns are downcast to the smallest dtype that holds them
+exactly. Columns are then opened with np.load(mmap_mode="r"), so every worker
+process reads the same OS pages instead of parsing its own DataFrames.
+
+The fingerprint covers the CSV's size and mtime, so an edited CSV gets a fresh
+build. Builds are written to a temporary directory and renamed into place, so
+concurrent builders never expose a partial store.
+
+    python datastore.py            # build every dataset up front (e.g. at deploy time)
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.environ.get("MA206_DATA_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.environ.get("MA206_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+STORE_DIR = os.path.join(CACHE_DIR, "datasets")
+_FORMAT = 1  # bump when the on-disk layout changes
+
+_OPEN = {}
+_OPEN_LOCK = threading.Lock()
+
+class Dataset:
+    """One CSV as read-only columns; numeric values or category codes per column."""
+
+    def __init__(self, name, meta, root=None, arrays=None):
+        self.name = name
+        self.meta = meta
+        self.root = root  # None for the in-memory fallback
+        self.n_rows = meta["n_rows"]
+        self._cols = {c["name"]: c for c in meta["columns"]}
+        self._arrays = dict(arrays or {})
+        for arr in self._arrays.values():
+            arr.setflags(write=False)
+
+    def __repr__(self):
+        return f"Dataset({self.name!r}, rows={self.n_rows}, columns={len(self._cols)})"
+
+    @property
+    def columns(self):
+        return [c["name"] for c in self.meta["columns"]]
+
+    @property
+    def numeric_columns(self):
+        return [c["name"] for c in self.meta["columns"] if c["kind"] == "numeric"]
+
+    @property
+    def categorical_columns(self):
+        return [c["name"] for c in self.meta["columns"] if c["kind"] == "categorical"]
+
+    def info(self, col):
+        """Column metadata: kind, dtype, n_unique, n_missing (and categories)."""
+        return self._cols[col]
+
+    def column(self, col):
+        """Read-only array of values (numeric) or category codes (categorical)."""
+        arr = self._arrays.get(col)
+        if arr is None:
+            arr = np.load(os.path.join(self.root, self._cols[col]["file"]), mmap_mode="r")
+            self._arrays[col] = arr
+        return arr
+
+    def categories(self, col):
+        """Labels of a categorical column; code i means categories[i]."""
+        return self._cols[col]["categories"]
+
+    def labels(self, col):
+        """Decoded object array of a categorical column, None where missing."""
+        lut = np.array(list(self.categories(col)) + [None], dtype=object)
+        return lut[self.column(col)]  # code -1 picks the trailing None
+
+class Moments(NamedTuple):
+    """Count, sum and centered sum of squares (M2) of a column's non-missing values."""
+    n: int
+    total: float
+    m2: float
+
+    @classmethod
+    def of(cls, x):
+        x = np.asarray(x, dtype=float)
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return cls(0, 0.0, 0.0)
+        return cls(int(x.size), float(x.sum()), float(((x - x.mean()) ** 2).sum()))
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else math.nan
+
+    @property
+    def var(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def sd(self):
+        return math.sqrt(self.var)
+
+    def merge(self, other):
+        """Moments of the union of two disjoint groups (Chan et al.'s parallel update)."""
+        if not other.n:
+            return self
+        if not self.n:
+            return other
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        return Moments(n, self.total + other.total, self.m2 + other.m2 + delta * delta * self.n * other.n / n)
+
+    @classmethod
+    def combine(cls, parts):
+        """Merge any number of disjoint groups."""
+        out = cls(0, 0.0, 0.0)
+        for m in parts:
+            out = out.merge(m)
+        return out
+
+def column_moments(ds):
+    """{numeric column: Moments} for a Dataset."""
+    return {col: Moments.of(ds.column(col)) for col in ds.numeric_columns}
+
+# most distinct values a column may have to be offered as a grouping
+MAX_GROUP_LEVELS = 12
+
+def group_columns(ds, max_levels=MAX_GROUP_LEVELS):
+    """Categorical and integer columns with 2..max_levels distinct values."""
+    return [c["name"] for c in ds.meta["columns"]
+            if 2 <= c["n_unique"] <= max_levels
+            and (c["kind"] == "categorical" or np.dtype(c["dtype"]).kind in "iu")]
+
+def group_codes(ds, col):
+    """(codes, labels) for a grouping column; code -1 marks a missing value."""
+    if ds.info(col)["kind"] == "categorical":
+        return ds.column(col), ds.categories(col)
+    values, codes = np.unique(ds.column(col), return_inverse=True)
+    return codes, [str(v) for v in values]
+
+def _group_moments(codes, labels, x):
+    ok = (codes >= 0) & ~np.isnan(x)
+    g, x = codes[ok], x[ok]
+    k = len(labels)
+    n = np.bincount(g, minlength=k)
+    total = np.bincount(g, weights=x, minlength=k)
+    mean = np.divide(total, n, out=np.zeros(k), where=n > 0)
+    m2 = np.bincount(g, weights=(x - mean[g]) ** 2, minlength=k)
+    return {lab: Moments(int(n[i]), float(total[i]), float(m2[i])) for i, lab in enumerate(labels)}
+
+def group_index(ds):
+    """{(group column, numeric column): {level: Moments}} for every grouping × numeric pair."""
+    index = {}
+    values = {col: np.asarray(ds.column(col), dtype=float) for col in ds.numeric_columns}
+    for by in group_columns(ds):
+        codes, labels = group_codes(ds, by)
+        codes = np.asarray(codes, dtype=np.intp)
+        for col, x in values.items():
+            if col != by:
+                index[by, col] = _group_moments(codes, labels, x)
+    return index
+
+def count_cube(ds, cols):
+    """Joint counts over grouping columns in one np.bincount pass.
+
+    Axis i has one slot per level of cols[i] plus a last slot for missing
+    values, so slicing [:-1] on an axis drops rows missing that column.
+    """
+    flat, shape = np.zeros(ds.n_rows, dtype=np.int64), []
+    for col in cols:
+        codes, labels = group_codes(ds, col)
+        k = len(labels)
+        flat = flat * (k + 1) + np.where(np.asarray(codes) < 0, k, codes)
+        shape.append(k + 1)
+    return np.bincount(flat, minlength=math.prod(shape)).reshape(shape)
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def _popcount(words):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return int(_POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+class BitmapIndex:
+    """Packed-bit row sets for every level of a Dataset's grouping columns.
+
+    Row r is bit r of a uint64 word array. A filter {col: [levels]} ORs the
+    levels within a column and ANDs across columns, so any count is a few
+    bitwise ops plus a popcount over n_rows / 64 words.
+    """
+
+    def __init__(self, ds, cols=None):
+        self.n_rows = ds.n_rows
+        self.labels, self._bits = {}, {}
+        for col in cols if cols is not None else group_columns(ds):
+            codes, labels = group_codes(ds, col)
+            codes = np.asarray(codes)
+            # one row per level plus a last row for missing values
+            hot = codes[None, :] == np.arange(-1, len(labels))[:, None]
+            self.labels[col] = list(labels)
+            self._bits[col] = self._pack(np.roll(hot, -1, axis=0))
+        self.all = self._pack(np.ones((1, self.n_rows), dtype=bool))[0]
+
+    def _pack(self, rows):
+        packed = np.packbits(rows, axis=1, bitorder="little")
+        pad = -packed.shape[1] % 8
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+        words = np.ascontiguousarray(packed).view(np.uint64)
+        words.setflags(write=False)
+        return words
+
+    def rows(self, col, levels=None):
+        """Rows whose `col` is one of `levels` (default: any non-missing value)."""
+        bits = self._bits[col]
+        if levels is None:
+            return np.bitwise_or.reduce(bits[:-1], axis=0)
+        idx = [self.labels[col].index(v) for v in levels]
+        return np.bitwise_or.reduce(bits[idx], axis=0) if idx else np.zeros_like(self.all)
+
+    def select(self, where):
+        """Rows matching every {col: levels} clause (None: column not missing)."""
+        out = self.all
+        for col, levels in where.items():
+            out = out & self.rows(col, levels)
+        return out
+
+    def count(self, where=None, bits=None):
+        """Number of rows in `bits`, or matching `where`."""
+        return _popcount(self.select(where or {}) if bits is None else bits)
+
+def _fingerprint(path):
+    st = os.stat(path)
+    return hashlib.sha1(f"{st.st_size}:{st.st_mtime_ns}:{_FORMAT}".encode()).hexdigest()[:12]
+
+def _encode(s):
+    """(array, meta) for one parsed column."""
+    info = dict(name=str(s.name), n_unique=int(s.nunique()), n_missing=int(s.isna().sum()))
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        a = s.to_numpy()
+        if a.dtype.kind == "f" and not np.isnan(a).any() and np.array_equal(a, np.trunc(a)) \
+                and np.abs(a).max(initial=0) < 2**53:
+            a = a.astype(np.int64)
+        if a.dtype.kind in "iu":
+            a = pd.to_numeric(pd.Series(a), downcast="integer").to_numpy()
+        elif a.dtype.kind == "f":
+            small = a.astype(np.float32)
+            if np.array_equal(small.astype(a.dtype), a, equal_nan=True):
+                a = small
+        return np.ascontiguousarray(a), dict(info, kind="numeric", dtype=a.dtype.str)
+    if pd.api.types.is_bool_dtype(s):
+        s = s.map({True: "True", False: "False"})
+    cat = pd.Categorical(s.map(lambda v: v if pd.isna(v) else str(v)))
+    codes = np.ascontiguousarray(cat.codes)
+    return codes, dict(info, kind="categorical", dtype=codes.dtype.str,
+                       categories=[str(c) for c in cat.categories])
+
+def _parse(path):
+    df = pd.read_csv(path)
+    arrays, cols = {}, []
+    for i, name in enumerate(df.columns):
+        arr, info = _encode(df[name])
+        info["file"] = f"c{i:03d}.npy"
+        arrays[info["name"]] = arr
+        cols.append(info)
+    return arrays, dict(n_rows=len(df), columns=cols)
+
+def _build(name, path, root):
+    """Parse `path` and move the finished store to `root`."""
+    arrays, meta = _parse(path)
+    meta.update(source=os.path.basename(path), fingerprint=os.path.basename(root).rsplit("-", 1)[1])
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(tmp)
+    try:
+        for info in meta["columns"]:
+            np.save(os.path.join(tmp, info["file"]), arrays[info["name"]])
+        with open(os.path.join(tmp, "meta.json"), "w") as fh:
+            json.dump(meta, fh)
+        os.rename(tmp, root)  # atomic; fails if another builder got there first
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(os.path.join(root, "meta.json")):
+            raise
+    # drop stale builds of this dataset; open memory maps keep their files alive on POSIX
+    for entry in os.listdir(STORE_DIR):
+        if entry.rsplit("-", 1)[0] == name and os.path.join(STORE_DIR, entry) != root \
+                and not entry.endswith(".tmp"):
+            shutil.rmtree(os.path.join(STORE_DIR, entry), ignore_errors=True)
+
+def list_datasets():
+    """Names (CSV stems) of the datasets in DATA_DIR."""
+    return sorted(f[:-4] for f in os.listdir(DATA_DIR) if f.endswith(".csv"))
+
+def open_dataset(name):
+    """Dataset for DATA_DIR/<name>.csv, building its store on first use or after the CSV changes."""
+    path = os.path.join(DATA_DIR, f"{name}.csv")
+    fp = _fingerprint(path)
+    ds = _OPEN.get(name)
+    if ds is not None and ds.meta.get("fingerprint") == fp:
+        return ds
+    with _OPEN_LOCK:
+        ds = _OPEN.get(name)
+        if ds is not None and ds.meta.get("fingerprint") == fp:
+            return ds
+        root = os.path.join(STORE_DIR, f"{name}-{fp}")
+        try:
+            if not os.path.exists(os.path.join(root, "meta.json")):
+                _build(name, path, root)
+            with open(os.path.join(root, "meta.json")) as fh:
+                ds = Dataset(name, json.load(fh), root=root)
+        except OSError:
+            # read-only or full disk: serve this process from memory instead
+            arrays, meta = _parse(path)
+            meta["fingerprint"] = fp
+            ds = Dataset(name, meta, arrays=arrays)
+        _OPEN[name] = ds
+    return ds
+
+def build_all():
+    """Build (or validate) the store for every dataset."""
+    return {name: open_dataset(name) for name in list_datasets()}
+
+if __name__ == "__main__":
+    for ds in build_all().values():
+        print(ds, ds.root or "(in memory)")
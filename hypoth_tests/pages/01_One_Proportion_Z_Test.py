@@ -93,40 +93,39 @@ st.latex(r"Z = \frac{\hat{p} - \pi_0}{\sqrt{\frac{\pi_0(1-\pi_0)}{n}}} = \frac{0
 
 # Critical value
 z_crit = 0.649
-z_rej = norm.ppf(0.95)
+z_rej = critical_value(0.05, "right")
 
 # X-axis for normal distribution
-x = np.linspace(-3.5, 3.5, 400)
-y = norm.pdf(x, 0, 1)
-p_value = 1 - norm.cdf(z_crit)
-
-fig, ax = plt.subplots()
-
-# Plot the normal curve
-ax.plot(x, y, 'b', label="Standard Normal PDF")
-
-# Shade the rejection region (greater than z_crit)
-x_fill = np.linspace(z_crit, 3.5, 200)
-y_fill = norm.pdf(x_fill, 0, 1)
-ax.fill_between(x_fill, y_fill, alpha=0.4, color='red', label="Rejection Region")
-
-# Draw vertical line at critical value
-ax.axvline(z_crit, color='green', linestyle='--')
-ax.text(z_crit+0.05, 0.05, f"z = {z_crit}", color='red')
-ax.annotate(
-    f"P-value: {np.round(p_value,3)}",
-    xy = (1.5*z_crit, .5*norm.pdf(z_crit)),
-    xytext = (1.5, 0.25),
-    arrowprops = dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-# Labels
-ax.set_title("Right-Tailed Hypothesis Test")
-ax.set_xlabel("z")
-ax.set_ylabel("Density")
-ax.legend()
-
-st.pyplot(fig)
+g = curve_grid(None, -3.5, 3.5)
+x, y = g.x, g.pdf
+p_value = tail_prob(z_crit, "right")
+
+with phase("build plot: right-tail example"):
+    fig, ax = plt.subplots()
+
+    # Plot the normal curve
+    ax.plot(x, y, 'b', label="Standard Normal PDF")
+
+    # Shade the rejection region (greater than z_crit)
+    x_fill, y_fill = g.region(z_crit, 3.5)
+    ax.fill_between(x_fill, y_fill, alpha=0.4, color='red', label="Rejection Region")
+
+    # Draw vertical line at critical value
+    ax.axvline(z_crit, color='green', linestyle='--')
+    ax.text(z_crit+0.05, 0.05, f"z = {z_crit}", color='red')
+    ax.annotate(
+        f"P-value: {np.round(p_value,3)}",
+        xy = (1.5*z_crit, .5*norm.pdf(z_crit)),
+        xytext = (1.5, 0.25),
+        arrowprops = dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    # Labels
+    ax.set_title("Right-Tailed Hypothesis Test")
+    ax.set_xlabel("z")
+    ax.set_ylabel("Density")
+    ax.legend()
+pyplot(fig)
 
 st.write("""
     Here is where we arrive at our evaluating the strength of our argument. Based on our standardized statistic, 
@@ -179,38 +178,37 @@ st.write("""
 
 # Critical values and p-value
 z_obs = -2.31
-p_value = norm.cdf(z_obs)   # left-tail probability
-z_crit = norm.ppf(0.05)     # critical cutoff at alpha = 0.05
+p_value = tail_prob(z_obs, "left")     # left-tail probability
+z_crit = critical_value(0.05, "left")  # critical cutoff at alpha = 0.05
 
 # Plot
-x = np.linspace(-3.5, 3.5, 400)
-y = norm.pdf(x)
-
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label="Standard Normal PDF")
-
-# Shade rejection region
-xx = np.linspace(-3.5, z_crit, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red', label="Rejection Region")
-
-# Draw observed Z and critical line
-ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
-ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = {z_crit:.2f}")
-
-# Annotate p-value
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(z_obs, norm.pdf(z_obs)),
-    xytext=(-1, 0.05),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-ax.set_title("Left-Tailed Hypothesis Test")
-ax.set_xlabel("z")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-
-st.pyplot(fig)
+g = curve_grid(None, -3.5, 3.5)
+x, y = g.x, g.pdf
+
+with phase("build plot: left-tail example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label="Standard Normal PDF")
+
+    # Shade rejection region
+    ax.fill_between(*g.region(-3.5, z_crit), alpha=0.4, color='red', label="Rejection Region")
+
+    # Draw observed Z and critical line
+    ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
+    ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = {z_crit:.2f}")
+
+    # Annotate p-value
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(z_obs, norm.pdf(z_obs)),
+        xytext=(-1, 0.05),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    ax.set_title("Left-Tailed Hypothesis Test")
+    ax.set_xlabel("z")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
     Based on our standardized statistic ($Z = {z_obs:.2f}$), the p-value is about {p_value:.3f}.
@@ -256,48 +254,46 @@ st.write("""
 
 # Observed Z and p-value
 z_obs = 1.80
-p_value = 2 * (1 - norm.cdf(abs(z_obs)))  # two-tailed
-z_crit = norm.ppf(1 - 0.05/2)             # critical cutoff at alpha = 0.05
+p_value = tail_prob(z_obs, "two")     # two-tailed
+z_crit = critical_value(0.05, "two")  # critical cutoff at alpha = 0.05
 
 # Plot
-x = np.linspace(-3.5, 3.5, 400)
-y = norm.pdf(x)
-
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label="Standard Normal PDF")
-
-# Shade rejection regions
-xx = np.linspace(z_crit, 3.5, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red', label="Rejection Regions")
-xx = np.linspace(-3.5, -z_crit, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red')
-
-# Draw observed Z and critical lines
-ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
-ax.axvline(-z_obs, color='green', linestyle='--')
-ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = ±{z_crit:.2f}")
-ax.axvline(-z_crit, color='pink', linestyle='--')
-
-# Annotate p-value
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(-z_obs, norm.pdf(z_obs)),
-    xytext=(-1.0, 0.1),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(z_obs, norm.pdf(-z_obs)),
-    xytext=(-1.0, 0.1),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-ax.set_title("Two-Sided Hypothesis Test")
-ax.set_xlabel("z")
-ax.set_ylabel("Density")
-ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
-
-st.pyplot(fig)
+g = curve_grid(None, -3.5, 3.5)
+x, y = g.x, g.pdf
+
+with phase("build plot: two-sided example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label="Standard Normal PDF")
+
+    # Shade rejection regions
+    ax.fill_between(*g.region(z_crit, 3.5), alpha=0.4, color='red', label="Rejection Regions")
+    ax.fill_between(*g.region(-3.5, -z_crit), alpha=0.4, color='red')
+
+    # Draw observed Z and critical lines
+    ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
+    ax.axvline(-z_obs, color='green', linestyle='--')
+    ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = ±{z_crit:.2f}")
+    ax.axvline(-z_crit, color='pink', linestyle='--')
+
+    # Annotate p-value
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(-z_obs, norm.pdf(z_obs)),
+        xytext=(-1.0, 0.1),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(z_obs, norm.pdf(-z_obs)),
+        xytext=(-1.0, 0.1),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    ax.set_title("Two-Sided Hypothesis Test")
+    ax.set_xlabel("z")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+pyplot(fig)
 
 st.write(f"""
     Based on our standardized statistic ($Z = {z_obs:.2f}$), the two-sided p-value is about {p_value:.3f}.
@@ -310,10 +306,17 @@ st.write(f"""
 st.divider()
 
 st.subheader("Practice: One-Proportion Z-Test")
+source = st.radio("Data", ["Type counts", "Use a dataset"], horizontal=True, key="z1_source")
 col1, col2 = st.columns(2)
 with col1:
-    n = st.number_input("Sample size (n)", min_value=1, value=200)
-    X = st.number_input("Number of successes (X)", min_value=0, value=12)
+    if source == "Use a dataset":
+        counts = proportion_picker("z1")
+        if counts is None:
+            st.stop()
+        X, n = counts
+    else:
+        n = st.number_input("Sample size (n)", min_value=1, value=200)
+        X = st.number_input("Number of successes (X)", min_value=0, value=12)
     p0 = st.number_input("Null proportion (π₀)", min_value=0.0, max_value=1.0, value=0.05, step=0.01)
 with col2:
     tail = tail_choice()
@@ -322,13 +325,17 @@ with col2:
 
 phat = X/n
 z_obs = (phat - p0)/np.sqrt(p0*(1-p0)/n)
-if tail == "right":
-    pval = 1 - norm.cdf(z_obs)
-elif tail == "left":
-    pval = norm.cdf(z_obs)
-else:
-    pval = 2*min(norm.cdf(z_obs), 1 - norm.cdf(z_obs))
+pval = tail_prob(z_obs, tail)
 
 st.latex(f"\hat p = {phat:.3f},\quad Z={z_obs:.3f},\quad \\text{{p-value}}={pval:.3f}")
 plot_normal_test(z_obs, alpha, tail)
 (st.success if pval < alpha else st.warning)("Reject H₀" if pval < alpha else "Fail to reject H₀")
+
+with st.expander("Simulate the null: what p̂ looks like when π = π₀"):
+    st.write(
+        "Instead of the normal curve, draw many samples of size $n$ from a population where $H_0$ is true and see "
+        "how often $\\hat p$ comes out at least as extreme as ours. Each sample is one binomial draw, and only the "
+        "count of samples for each possible $X$ is kept, so any number of draws fits in the same memory."
+    )
+    one_proportion_simulation_panel(X, n, p0, tail, pval, "z1")
+
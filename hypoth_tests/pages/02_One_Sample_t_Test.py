@@ -68,38 +68,38 @@ n, xbar, s, mu0 = 20, 6.5, 0.8, 7.0
 t_obs = (xbar - mu0) / (s / np.sqrt(n))
 df = n - 1
 alpha = 0.05
-p_value = t.cdf(t_obs, df)  # left-tailed
-t_crit = t.ppf(alpha, df)
+p_value = tail_prob(t_obs, "left", df)  # left-tailed
+t_crit = critical_value(alpha, "left", df)
 
 # Plot
 import matplotlib.pyplot as plt
-x = np.linspace(-4, 4, 400)
-y = t.pdf(x, df)
-
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label=f"t-dist (df={df})")
-
-# Shade rejection region
-xx = np.linspace(-4, t_crit, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red', label="Rejection Region")
-
-# Draw observed t
-ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
-ax.axvline(t_crit, color='pink', linestyle='--', label=f"Critical t = {t_crit:.2f}")
-
-# Annotate
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(t_obs, t.pdf(t_obs, df)),
-    xytext=(-3, 0.05),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-ax.set_title("Left-Tailed t-Test Example")
-ax.set_xlabel("t")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+g = curve_grid(df, -4, 4)
+x, y = g.x, g.pdf
+
+with phase("build plot: left-tail example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label=f"t-dist (df={df})")
+
+    # Shade rejection region
+    ax.fill_between(*g.region(-4, t_crit), alpha=0.4, color='red', label="Rejection Region")
+
+    # Draw observed t
+    ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
+    ax.axvline(t_crit, color='pink', linestyle='--', label=f"Critical t = {t_crit:.2f}")
+
+    # Annotate
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(t_obs, t.pdf(t_obs, df)),
+        xytext=(-3, 0.05),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    ax.set_title("Left-Tailed t-Test Example")
+    ax.set_xlabel("t")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
     Based on our standardized statistic ($t = {t_obs:.2f}$ with df={df}), the p-value is about {p_value:.3f}.
@@ -126,45 +126,44 @@ n, xbar, s, mu0 = 15, 47, 5, 50
 t_obs = (xbar - mu0) / (s / np.sqrt(n))
 df = n - 1
 alpha = 0.05
-p_value = 2 * (1 - t.cdf(abs(t_obs), df))
-t_crit = t.ppf(1 - alpha/2, df)
+p_value = tail_prob(t_obs, "two", df)
+t_crit = critical_value(alpha, "two", df)
 
 st.latex(r"""
     t = \frac{47 - 50}{5/\sqrt{15}} \approx """ + f"{t_obs:.2f}"
 )
 
 # Plot
-x = np.linspace(-4, 4, 400)
-y = t.pdf(x, df)
-
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label=f"t-dist (df={df})")
-
-# Shade rejection regions
-xx = np.linspace(t_crit, 4, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red', label="Rejection Regions")
-xx = np.linspace(-4, -t_crit, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red')
-
-# Draw observed t and criticals
-ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
-ax.axvline(-t_obs, color='green', linestyle='--')
-ax.axvline(t_crit, color='pink', linestyle='--', label=f"Critical t = ±{t_crit:.2f}")
-ax.axvline(-t_crit, color='pink', linestyle='--')
-
-# Annotate
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(t_obs, t.pdf(t_obs, df)),
-    xytext=(-2.5, 0.1),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-ax.set_title("Two-Sided t-Test Example")
-ax.set_xlabel("t")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+g = curve_grid(df, -4, 4)
+x, y = g.x, g.pdf
+
+with phase("build plot: two-sided example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label=f"t-dist (df={df})")
+
+    # Shade rejection regions
+    ax.fill_between(*g.region(t_crit, 4), alpha=0.4, color='red', label="Rejection Regions")
+    ax.fill_between(*g.region(-4, -t_crit), alpha=0.4, color='red')
+
+    # Draw observed t and criticals
+    ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
+    ax.axvline(-t_obs, color='green', linestyle='--')
+    ax.axvline(t_crit, color='pink', linestyle='--', label=f"Critical t = ±{t_crit:.2f}")
+    ax.axvline(-t_crit, color='pink', linestyle='--')
+
+    # Annotate
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(t_obs, t.pdf(t_obs, df)),
+        xytext=(-2.5, 0.1),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    ax.set_title("Two-Sided t-Test Example")
+    ax.set_xlabel("t")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
     Based on our standardized statistic ($t = {t_obs:.2f}$ with df={df}), the two-sided p-value is about {p_value:.3f}.
@@ -175,11 +174,17 @@ st.write(f"""
 st.divider()
 
 st.subheader("Practice: One-Sample t-Test")
+source = st.radio("Data", ["Type summary statistics", "Use a dataset"], horizontal=True, key="t1_source")
 col1, col2 = st.columns(2)
 with col1:
-    n = st.number_input("Sample size (n)", min_value=2, value=20)
-    xbar = st.number_input("Sample mean (x̄)", value=6.5)
-    s = st.number_input("Sample standard deviation (s)", value=0.8)
+    if source == "Use a dataset":
+        name, column, m = dataset_column_picker("t1")
+        n, xbar, s = m.n, m.mean, m.sd
+        st.caption(f"`{name}.csv` › {column}: n = {n}, x̄ = {xbar:.3f}, s = {s:.3f}")
+    else:
+        n = st.number_input("Sample size (n)", min_value=2, value=20)
+        xbar = st.number_input("Sample mean (x̄)", value=6.5)
+        s = st.number_input("Sample standard deviation (s)", value=0.8)
     mu0 = st.number_input("Null mean (μ₀)", value=7.0)
 with col2:
     tail = tail_choice()
@@ -189,12 +194,7 @@ with col2:
 t_obs = (xbar - mu0) / (s / np.sqrt(n))
 df = n - 1
 
-if tail == "right":
-    pval = 1 - t.cdf(t_obs, df)
-elif tail == "left":
-    pval = t.cdf(t_obs, df)
-else:
-    pval = 2*min(t.cdf(t_obs, df), 1 - t.cdf(t_obs, df))
+pval = tail_prob(t_obs, tail, df)
 
 st.latex(f"\\bar x = {xbar:.3f},\\quad t={t_obs:.3f},\\quad df={df},\\quad \\text{{p-value}}={pval:.3f}")
 plot_t_test(t_obs, alpha, tail, df)
@@ -13,9 +13,13 @@ with colA:
 with colB:
     reps = st.slider("Number of intervals", 10, 300, 30, step=5)
     speed = st.slider("Animation speed (sec/frame)", 0.02, 0.5, 0.12)
+    browser_play = st.checkbox("Play in browser", value=False,
+                               help="Send the whole animation once and let the browser play it.")
 with colC:
     seed = st.number_input("Resampling seed", min_value=0, value=206, step=1)
     sample_mean = st.number_input("Population mean (μ)", value=75.0)
+    engine_label = st.radio("Sampling engine", ["Resample population", "Analytic (normal theory)"])
+engine = "analytic" if engine_label.startswith("Analytic") else "resample"
 
 # session_state for dataset seed + animation state
 if "dataset_seed" not in st.session_state: st.session_state.dataset_seed = 123456
@@ -31,10 +35,17 @@ if c1.button("🎲 Generate / Reset"):
     st.session_state.k = 0
     st.session_state.playing = False
 
+# intervals follow the controls: any change rebuilds them and restarts the animation
+ci_params = (n, reps, conf, seed, sample_mean, engine, st.session_state.dataset_seed)
+if st.session_state.get("ci_params") != ci_params:
+    st.session_state.ci_data = None
+    st.session_state.k = 0
+    st.session_state.ci_params = ci_params
+
 if c2.button("▶️ Play"):
     if st.session_state.ci_data is None:
         pop = make_pop(sample_mean, 10, 30_000, st.session_state.dataset_seed)
-        st.session_state.ci_data = compute_intervals(pop, n, reps, conf, seed=seed)
+        st.session_state.ci_data = compute_intervals(pop, n, reps, conf, seed=seed, mem_budget=COVERAGE_MEM_BUDGET, engine=engine)
         st.session_state.k = 0
     st.session_state.playing = True
 
@@ -46,29 +57,72 @@ pop = make_pop(sample_mean, 10, 30_000, st.session_state.dataset_seed)
 
 # if intervals not built yet (e.g., first render), build once
 if st.session_state.ci_data is None:
-    st.session_state.ci_data = compute_intervals(pop, n, reps, conf, seed=seed)
+    st.session_state.ci_data = compute_intervals(pop, n, reps, conf, seed=seed, mem_budget=COVERAGE_MEM_BUDGET, engine=engine)
 
 placeholder = st.empty()
 prog = st.progress(0)
 
+# incremental renderer for this run only (its canvas is not kept between reruns);
+# frames only stamp new intervals
+animator = IntervalAnimator(st.session_state.ci_data, conf, n, reps)
+
 # animate or render static
-if st.session_state.playing:
-    while st.session_state.k < reps and st.session_state.playing:
-        st.session_state.k += 1
-        fig = draw_frame(st.session_state.ci_data, st.session_state.k, conf, n, reps)
-        placeholder.pyplot(fig)
-        prog.progress(st.session_state.k / reps)
-        plt.close(fig)
-        time.sleep(float(speed))
+if st.session_state.playing and browser_play:
+    with phase("build browser animation"):
+        html, height = coverage_animation_html(st.session_state.ci_data, conf, n, reps, speed)
+    with placeholder.container():
+        st.iframe(html, height=height)
+    st.session_state.k = reps
+    prog.progress(1.0)
+    st.session_state.playing = False
+elif st.session_state.playing:
+    with phase("play animation"):  # includes the frame sleeps
+        while st.session_state.k < reps and st.session_state.playing:
+            st.session_state.k += 1
+            animator.advance(st.session_state.k)
+            placeholder.image(animator.image(), width="stretch")
+            prog.progress(st.session_state.k / reps)
+            time.sleep(float(speed))
     st.session_state.playing = False
 else:
     k = max(1, st.session_state.k)
-    fig = draw_frame(st.session_state.ci_data, k, conf, n, reps)
-    placeholder.pyplot(fig)
-    plt.close(fig)
+    with phase("render frame"):
+        animator.advance(k)
+        placeholder.image(animator.image(), width="stretch")
     prog.progress(k / reps)
 
 # summary
 data = st.session_state.ci_data
 final_cov = (data["hit"][:max(1, st.session_state.k)].mean() * 100).round(1)
 st.info(f"Coverage so far: **{final_cov}%**  |  Target: **{conf}%**")
+
+# long-run coverage: far more intervals than the animation can show
+with st.expander("Long-run coverage (many intervals)"):
+    st.write(
+        "The animation only shows a few hundred intervals. This check uses the selected engine "
+        "(large resampling runs are spread over every CPU core): "
+        "the analytic engine draws $\\bar{x}$ and $s$ directly from their sampling distributions, "
+        "while resampling draws full samples from the population."
+    )
+    big_reps = st.select_slider("Intervals to simulate", [10_000, 100_000, 1_000_000, 5_000_000], value=1_000_000)
+    if st.button("Run long-run check"):
+        big = compute_intervals(pop, n, big_reps, conf, seed=seed, mem_budget=COVERAGE_MEM_BUDGET,
+                                engine=engine, workers="auto")
+        st.info(f"Coverage over **{big_reps:,}** intervals: **{big['hit'].mean() * 100:.2f}%**  |  Target: **{conf}%**")
+
+# coverage over a whole (n, confidence) grid at once
+with st.expander("Coverage surface over sample size and confidence"):
+    st.write(
+        "Each cell repeats the experiment above for one $(n, \\text{confidence})$ pair. Blue cells cover "
+        "more often than promised, red cells less often. All confidence levels for a given $n$ reuse the "
+        "same samples, since only $t^*$ changes."
+    )
+    grid_ns = (10, 15, 20, 30, 50, 75, 100, 200, 400)
+    grid_confs = tuple(range(80, 100))
+    surf_reps = st.select_slider("Intervals per cell", [1_000, 5_000, 20_000], value=5_000)
+    if st.button("Build coverage surface"):
+        with phase("coverage surface"):
+            cov = coverage_surface(sample_mean, 10, 30_000, st.session_state.dataset_seed,
+                                   grid_ns, grid_confs, surf_reps, int(seed), engine=engine)
+        fig = plot_coverage_surface(cov, grid_ns, grid_confs, surf_reps)
+        pyplot(fig)
@@ -3,7 +3,6 @@ import math
 import numpy as np
 import matplotlib.pyplot as plt
 import streamlit as st
-from scipy.stats import norm
 
 from utils import *
 
@@ -37,20 +36,31 @@ st.caption("Here $z^*$ is the critical value from the Standard Normal distributi
 st.divider()
 st.subheader("Inputs")
 
-col1, col2, col3 = st.columns(3)
-with col1:
-    n = st.number_input("Sample size (n)", min_value=1, value=100, step=1)
-with col2:
-    X = st.number_input("Successes (X)", min_value=0, max_value=int(n), value=56, step=1)
-with col3:
-    conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
+source = st.radio("Data", ["Type counts", "Use a dataset"], horizontal=True, key="p1_source")
+if source == "Use a dataset":
+    col1, col2 = st.columns(2)
+    with col1:
+        counts = proportion_picker("p1")
+        if counts is None:
+            st.stop()
+        X, n = counts
+    with col2:
+        conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
+else:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n = st.number_input("Sample size (n)", min_value=1, value=100, step=1)
+    with col2:
+        X = st.number_input("Successes (X)", min_value=0, max_value=int(n), value=56, step=1)
+    with col3:
+        conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
 
 # -----------------
 # Compute CI (Wald / textbook)
 # -----------------
 phat = X / n
 alpha = 1 - conf / 100
-z_star = norm.ppf(1 - alpha / 2)
+z_star = critical_value(alpha, "two")
 SE = math.sqrt(phat * (1 - phat) / n)
 lo = phat - z_star * SE
 hi = phat + z_star * SE
@@ -71,16 +81,17 @@ st.latex(
 # -----------------
 # Visualization
 # -----------------
-fig, ax = plt.subplots(figsize=(6, 1.6))
-ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax.plot(phat, 1, "o", color="tab:blue")
-ax.set_xlim(-0.05, 1.05)
-ax.set_yticks([])
-ax.set_xlabel("Proportion")
-ax.set_title(f"{conf}% CI for one proportion (n={n}, X={X})")
-ax.grid(axis="x", alpha=0.25)
-st.pyplot(fig)
+with phase("build plot: interval"):
+    fig, ax = plt.subplots(figsize=(6, 1.6))
+    ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax.plot(phat, 1, "o", color="tab:blue")
+    ax.set_xlim(-0.05, 1.05)
+    ax.set_yticks([])
+    ax.set_xlabel("Proportion")
+    ax.set_title(f"{conf}% CI for one proportion (n={n}, X={X})")
+    ax.grid(axis="x", alpha=0.25)
+pyplot(fig)
 
 # -----------------
 # Interpretation
@@ -88,4 +99,25 @@ st.pyplot(fig)
 st.info(
     f"We are {conf}% confident that the true population proportion lies between "
     f"{lo:.3f} and {hi:.3f}."
-)
\ No newline at end of file
+)
+
+# -----------------
+# Exact coverage of each method
+# -----------------
+st.divider()
+with st.expander("How often does each method actually cover π? (exact coverage)"):
+    st.write(
+        "The Wald interval above is not the only recipe. For a fixed $n$, each method gives one interval "
+        "for every possible count $X = 0, \\dots, n$. The coverage at a true $\\pi$ is the total binomial "
+        "probability of the counts whose interval contains $\\pi$, so these curves are exact, not simulated. "
+        "The saw-tooth pattern comes from $X$ being discrete."
+    )
+    cov_n = st.slider("Sample size for the coverage plot (n)", 5, 500, value=min(int(n), 500), key="cov_n")
+    with phase("exact coverage"):
+        pis, cov = exact_coverage(int(cov_n), float(conf))
+    fig3 = plot_exact_coverage(pis, cov, int(cov_n), float(conf))
+    pyplot(fig3)
+    st.caption(
+        "Wald falls well short of its nominal level near 0 and 1, Wilson and Agresti–Coull hover "
+        "around it, and Clopper–Pearson never drops below it."
+    )
@@ -2,7 +2,7 @@
 import math
 import matplotlib.pyplot as plt
 import streamlit as st
-from scipy.stats import t
+from utils import *
 
 st.set_page_config(page_title="One-Sample Mean Confidence Interval", layout="centered")
 st.title("One-Sample Mean Confidence Interval")
@@ -30,13 +30,19 @@ st.caption("Here $t^*$ is the critical value from the Student t-distribution wit
 st.divider()
 st.subheader("Inputs")
 
-col1, col2, col3 = st.columns(3)
-with col1:
-    n = st.number_input("Sample size (n)", min_value=2, value=25, step=1)
-with col2:
-    xbar = st.number_input("Sample mean (x̄)", value=50.0, step=0.5)
-with col3:
-    s = st.number_input("Sample standard deviation (s)", min_value=0.0001, value=10.0, step=0.5)
+source = st.radio("Data", ["Type summary statistics", "Use a dataset"], horizontal=True, key="ci1_source")
+if source == "Use a dataset":
+    name, column, m = dataset_column_picker("ci1")
+    n, xbar, s = m.n, m.mean, m.sd
+    st.caption(f"`{name}.csv` › {column}: n = {n}, x̄ = {xbar:.3f}, s = {s:.3f}")
+else:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n = st.number_input("Sample size (n)", min_value=2, value=25, step=1)
+    with col2:
+        xbar = st.number_input("Sample mean (x̄)", value=50.0, step=0.5)
+    with col3:
+        s = st.number_input("Sample standard deviation (s)", min_value=0.0001, value=10.0, step=0.5)
 
 conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
 
@@ -45,7 +51,7 @@ conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
 # -----------------
 alpha = 1 - conf / 100
 df = n - 1
-t_star = t.ppf(1 - alpha / 2, df)
+t_star = critical_value(alpha, "two", df)
 SE = s / math.sqrt(n)
 lo = xbar - t_star * SE
 hi = xbar + t_star * SE
@@ -66,16 +72,17 @@ st.latex(
 # -----------------
 # Visualization
 # -----------------
-fig, ax = plt.subplots(figsize=(6, 1.6))
-ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax.plot(xbar, 1, "o", color="tab:blue")
-ax.set_xlim(xbar - 4 * SE, xbar + 4 * SE)  # auto-scale around mean
-ax.set_yticks([])
-ax.set_xlabel("Mean")
-ax.set_title(f"{conf}% CI for one mean (n={n}, df={df})")
-ax.grid(axis="x", alpha=0.25)
-st.pyplot(fig)
+with phase("build plot: interval"):
+    fig, ax = plt.subplots(figsize=(6, 1.6))
+    ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax.plot(xbar, 1, "o", color="tab:blue")
+    ax.set_xlim(xbar - 4 * SE, xbar + 4 * SE)  # auto-scale around mean
+    ax.set_yticks([])
+    ax.set_xlabel("Mean")
+    ax.set_title(f"{conf}% CI for one mean (n={n}, df={df})")
+    ax.grid(axis="x", alpha=0.25)
+pyplot(fig)
 
 # -----------------
 # Interpretation
@@ -84,3 +91,12 @@ st.info(
     f"We are {conf}% confident that the true population mean lies between "
     f"{lo:.3f} and {hi:.3f}."
 )
+
+if source == "Use a dataset":
+    with st.expander("Bootstrap intervals from the raw data"):
+        st.write(
+            "The bootstrap resamples the data with replacement many times and uses the spread of the resampled means "
+            "instead of the t model. The percentile interval reads the middle of that spread directly; the basic and "
+            "BCa intervals correct it for bias and, for BCa, skewness."
+        )
+        bootstrap_panel((column_values(name, column),), conf, (lo, hi), "ci1", "Resampled mean")
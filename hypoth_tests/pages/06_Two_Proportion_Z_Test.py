@@ -2,7 +2,6 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import norm
 from utils import *
 
 st.title("Two-Proportion Z-Test")
@@ -83,27 +82,27 @@ p1_hat, p2_hat = x1/n1, x2/n2
 p_pool = (x1 + x2) / (n1 + n2)
 SE = np.sqrt(p_pool*(1-p_pool)*(1/n1 + 1/n2))
 z_obs = (p1_hat - p2_hat)/SE
-p_value = 1 - norm.cdf(z_obs)  # right-tailed
+p_value = tail_prob(z_obs, "right")  # right-tailed
 alpha = 0.05
 
 # Plot
-x = np.linspace(-4, 4, 400)
-y = norm.pdf(x)
+g = curve_grid(None, -4, 4)
+x, y = g.x, g.pdf
 
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label="Standard Normal PDF")
+with phase("build plot: right-tail example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label="Standard Normal PDF")
 
-# Shade rejection region
-xx = np.linspace(z_obs, 4, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red', label="Rejection Region")
+    # Shade rejection region
+    ax.fill_between(*g.region(z_obs, 4), alpha=0.4, color='red', label="Rejection Region")
 
-ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
+    ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
 
-ax.set_title("Right-Tailed Two-Proportion Z-Test")
-ax.set_xlabel("z")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+    ax.set_title("Right-Tailed Two-Proportion Z-Test")
+    ax.set_xlabel("z")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
 Based on our standardized statistic ($Z = {z_obs:.2f}$), the p-value is about {p_value:.3f}.  
@@ -125,30 +124,29 @@ st.latex(r"""\begin{align*}
     H_A &: \pi_1 \neq \pi_2
 \end{align*}""")
 
-p_value_two = 2*(1 - norm.cdf(abs(z_obs)))
-z_crit = norm.ppf(1 - alpha/2)
+p_value_two = tail_prob(z_obs, "two")
+z_crit = critical_value(alpha, "two")
 
-x = np.linspace(-4, 4, 400)
-y = norm.pdf(x)
+g = curve_grid(None, -4, 4)
+x, y = g.x, g.pdf
 
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label="Standard Normal PDF")
+with phase("build plot: two-sided example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label="Standard Normal PDF")
 
-# Shade both tails
-xx = np.linspace(z_crit, 4, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red', label="Rejection Regions")
-xx = np.linspace(-4, -z_crit, 200)
-ax.fill_between(xx, norm.pdf(xx), alpha=0.4, color='red')
+    # Shade both tails
+    ax.fill_between(*g.region(z_crit, 4), alpha=0.4, color='red', label="Rejection Regions")
+    ax.fill_between(*g.region(-4, -z_crit), alpha=0.4, color='red')
 
-ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
-ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = ±{z_crit:.2f}")
-ax.axvline(-z_crit, color='pink', linestyle='--')
+    ax.axvline(z_obs, color='green', linestyle='--', label=f"Observed Z = {z_obs:.2f}")
+    ax.axvline(z_crit, color='pink', linestyle='--', label=f"Critical Z = ±{z_crit:.2f}")
+    ax.axvline(-z_crit, color='pink', linestyle='--')
 
-ax.set_title("Two-Sided Two-Proportion Z-Test")
-ax.set_xlabel("z")
-ax.set_ylabel("Density")
-ax.legend(loc="upper left", bbox_to_anchor=(1,1))
-st.pyplot(fig)
+    ax.set_title("Two-Sided Two-Proportion Z-Test")
+    ax.set_xlabel("z")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper left", bbox_to_anchor=(1,1))
+pyplot(fig)
 
 st.write(f"""
 For a two-sided test, the p-value is about {p_value_two:.3f}.  
@@ -158,12 +156,19 @@ We would {"reject" if p_value_two < alpha else "fail to reject"} $H_0$ at $\\alp
 st.divider()
 st.subheader("Practice: Two-Proportion Z-Test")
 
+source = st.radio("Data", ["Type counts", "Use a dataset"], horizontal=True, key="z2_source")
 col1, col2 = st.columns(2)
 with col1:
-    n1 = st.number_input("Sample size group 1 (n₁)", min_value=1, value=100)
-    x1 = st.number_input("Successes group 1 (X₁)", min_value=0, value=30)
-    n2 = st.number_input("Sample size group 2 (n₂)", min_value=1, value=120)
-    x2 = st.number_input("Successes group 2 (X₂)", min_value=0, value=20)
+    if source == "Use a dataset":
+        groups = two_proportion_picker("z2")
+        if groups is None:
+            st.stop()
+        (_, x1, n1), (_, x2, n2) = groups
+    else:
+        n1 = st.number_input("Sample size group 1 (n₁)", min_value=1, value=100)
+        x1 = st.number_input("Successes group 1 (X₁)", min_value=0, value=30)
+        n2 = st.number_input("Sample size group 2 (n₂)", min_value=1, value=120)
+        x2 = st.number_input("Successes group 2 (X₂)", min_value=0, value=20)
 with col2:
     tail = tail_choice()
     alpha_percent = st.slider("α (%)", 1, 20, value=5)
@@ -174,12 +179,7 @@ p_pool = (x1 + x2) / (n1 + n2)
 SE = np.sqrt(p_pool*(1-p_pool)*(1/n1 + 1/n2))
 z_obs = (p1_hat - p2_hat)/SE
 
-if tail == "right":
-    pval = 1 - norm.cdf(z_obs)
-elif tail == "left":
-    pval = norm.cdf(z_obs)
-else:
-    pval = 2*min(norm.cdf(z_obs), 1 - norm.cdf(z_obs))
+pval = tail_prob(z_obs, tail)
 
 st.latex(
     f"\\hat p_1 = {p1_hat:.3f},\\quad "
@@ -189,3 +189,12 @@ st.latex(
 )
 plot_normal_test(z_obs, alpha, tail)
 (st.success if pval < alpha else st.warning)("Reject H₀" if pval < alpha else "Fail to reject H₀")
+
+with st.expander("Simulation-based p-value: shuffle the group labels"):
+    st.write(
+        "If $H_0$ is true, group membership has nothing to do with success. Keeping the group sizes and the total "
+        "number of successes fixed, shuffling the labels gives group 1 a **hypergeometric** number of successes, "
+        "so each simulated table is one random draw. The exact (Fisher) p-value adds up those hypergeometric "
+        "probabilities directly; the simulated p-value settles toward it as more tables are drawn."
+    )
+    two_proportion_simulation_panel(x1, n1, x2, n2, tail, pval, "z2")
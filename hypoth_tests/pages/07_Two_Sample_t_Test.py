@@ -2,7 +2,6 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import t
 from utils import *
 
 st.title("Two-Sample t-Test")
@@ -64,30 +63,29 @@ t_obs = (xbar1 - xbar2)/SE
 # Welch–Satterthwaite df
 df = ((s1**2/n1 + s2**2/n2)**2) / ((s1**2/n1)**2/(n1-1) + (s2**2/n2)**2/(n2-1))
 alpha = 0.05
-p_value = 2*(1 - t.cdf(abs(t_obs), df))
-tcrit = t.ppf(1 - alpha/2, df)
+p_value = tail_prob(t_obs, "two", df)
+tcrit = critical_value(alpha, "two", df)
 
 # Plot
-x = np.linspace(-4, 4, 400)
-y = t.pdf(x, df)
+g = curve_grid(df, -4, 4)
+x, y = g.x, g.pdf
 
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label=f"t-dist (df≈{df:.1f})")
+with phase("build plot: two-sided example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label=f"t-dist (df≈{df:.1f})")
 
-xx = np.linspace(tcrit, 4, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red', label="Rejection Regions")
-xx = np.linspace(-4, -tcrit, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red')
+    ax.fill_between(*g.region(tcrit, 4), alpha=0.4, color='red', label="Rejection Regions")
+    ax.fill_between(*g.region(-4, -tcrit), alpha=0.4, color='red')
 
-ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
-ax.axvline(tcrit, color='pink', linestyle='--', label=f"Critical t = ±{tcrit:.2f}")
-ax.axvline(-tcrit, color='pink', linestyle='--')
+    ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
+    ax.axvline(tcrit, color='pink', linestyle='--', label=f"Critical t = ±{tcrit:.2f}")
+    ax.axvline(-tcrit, color='pink', linestyle='--')
 
-ax.set_title("Two-Sided Two-Sample t-Test Example")
-ax.set_xlabel("t")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+    ax.set_title("Two-Sided Two-Sample t-Test Example")
+    ax.set_xlabel("t")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
 Based on our standardized statistic ($t = {t_obs:.2f}$ with df≈{df:.1f}), the p-value is about {p_value:.3f}.  
@@ -99,15 +97,25 @@ This means our data {"suggests a difference in sleep hours" if p_value < alpha e
 st.divider()
 st.subheader("Practice: Two-Sample t-Test")
 
+source = st.radio("Data", ["Type summary statistics", "Use a dataset"], horizontal=True, key="t2_source")
 col1, col2 = st.columns(2)
 with col1:
-    n1 = st.number_input("Sample size group 1 (n₁)", min_value=2, value=15)
-    xbar1 = st.number_input("Sample mean group 1 (x̄₁)", value=6.2)
-    s1 = st.number_input("Sample std dev group 1 (s₁)", value=0.9)
-    n2 = st.number_input("Sample size group 2 (n₂)", min_value=2, value=18)
+    if source == "Use a dataset":
+        groups = two_group_picker("t2", with_values=True)
+        if groups is None:
+            st.stop()
+        (_, m1, values1), (_, m2, values2) = groups
+        n1, xbar1, s1 = m1.n, m1.mean, m1.sd
+        n2, xbar2, s2 = m2.n, m2.mean, m2.sd
+    else:
+        n1 = st.number_input("Sample size group 1 (n₁)", min_value=2, value=15)
+        xbar1 = st.number_input("Sample mean group 1 (x̄₁)", value=6.2)
+        s1 = st.number_input("Sample std dev group 1 (s₁)", value=0.9)
+        n2 = st.number_input("Sample size group 2 (n₂)", min_value=2, value=18)
 with col2:
-    xbar2 = st.number_input("Sample mean group 2 (x̄₂)", value=6.8)
-    s2 = st.number_input("Sample std dev group 2 (s₂)", value=0.7)
+    if source != "Use a dataset":
+        xbar2 = st.number_input("Sample mean group 2 (x̄₂)", value=6.8)
+        s2 = st.number_input("Sample std dev group 2 (s₂)", value=0.7)
     tail = tail_choice()
     alpha_percent = st.slider("α (%)", 1, 20, value=5)
     alpha = alpha_percent/100
@@ -116,12 +124,7 @@ SE = np.sqrt((s1**2)/n1 + (s2**2)/n2)
 t_obs = (xbar1 - xbar2)/SE
 df = ((s1**2/n1 + s2**2/n2)**2) / ((s1**2/n1)**2/(n1-1) + (s2**2/n2)**2/(n2-1))
 
-if tail == "right":
-    pval = 1 - t.cdf(t_obs, df)
-elif tail == "left":
-    pval = t.cdf(t_obs, df)
-else:
-    pval = 2*min(t.cdf(t_obs, df), 1 - t.cdf(t_obs, df))
+pval = tail_prob(t_obs, tail, df)
 
 st.latex(
     f"\\bar x_1 = {xbar1:.3f},\\ "
@@ -133,3 +136,11 @@ st.latex(
 
 plot_t_test(t_obs, alpha, tail, round(df,2))
 (st.success if pval < alpha else st.warning)("Reject H₀" if pval < alpha else "Fail to reject H₀")
+
+if source == "Use a dataset":
+    with st.expander("Randomization test: shuffle the group labels"):
+        st.write(
+            "If $H_0$ is true the group labels are arbitrary, so we can shuffle them many times and see how often "
+            "a difference in means at least as extreme as ours appears by chance. No t model is needed."
+        )
+        permutation_panel(values1, values2, tail, alpha, "t2")
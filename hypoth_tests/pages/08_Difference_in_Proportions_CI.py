@@ -3,7 +3,7 @@ import math
 import matplotlib.pyplot as plt
 import streamlit as st
 import numpy as np
-from scipy.stats import norm
+from utils import *
 
 st.set_page_config(page_title="Difference in Proportions Confidence Interval", layout="centered")
 st.title("Difference in Proportions Confidence Interval")
@@ -60,7 +60,7 @@ p1_hat, p2_hat = x1/n1, x2/n2
 diff = p1_hat - p2_hat
 conf = 95
 alpha = 1 - conf/100
-z_star = norm.ppf(1 - alpha/2)
+z_star = critical_value(alpha, "two")
 SE = math.sqrt(p1_hat*(1-p1_hat)/n1 + p2_hat*(1-p2_hat)/n2)
 lo = diff - z_star * SE
 hi = diff + z_star * SE
@@ -77,17 +77,18 @@ st.latex(
 )
 
 # Visualization
-fig, ax = plt.subplots(figsize=(6, 1.6))
-ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax.plot(diff, 1, "o", color="tab:blue")
-ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
-ax.set_xlim(-0.5, 0.5)
-ax.set_yticks([])
-ax.set_xlabel("Difference in proportions")
-ax.set_title(f"{conf}% CI for difference in proportions")
-ax.grid(axis="x", alpha=0.25)
-st.pyplot(fig)
+with phase("build plot: example interval"):
+    fig, ax = plt.subplots(figsize=(6, 1.6))
+    ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax.plot(diff, 1, "o", color="tab:blue")
+    ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
+    ax.set_xlim(-0.5, 0.5)
+    ax.set_yticks([])
+    ax.set_xlabel("Difference in proportions")
+    ax.set_title(f"{conf}% CI for difference in proportions")
+    ax.grid(axis="x", alpha=0.25)
+pyplot(fig)
 
 st.info(
     f"We are {conf}% confident that the true difference "
@@ -102,19 +103,26 @@ st.info(
 st.divider()
 st.subheader("Practice: Difference in Proportions CI")
 
+source = st.radio("Data", ["Type counts", "Use a dataset"], horizontal=True, key="ci3_source")
 col1, col2 = st.columns(2)
 with col1:
-    n1 = st.number_input("Sample size group 1 (n₁)", min_value=1, value=100)
-    x1 = st.number_input("Successes group 1 (X₁)", min_value=0, value=30)
-    n2 = st.number_input("Sample size group 2 (n₂)", min_value=1, value=120)
-    x2 = st.number_input("Successes group 2 (X₂)", min_value=0, value=20)
+    if source == "Use a dataset":
+        groups = two_proportion_picker("ci3")
+        if groups is None:
+            st.stop()
+        (_, x1, n1), (_, x2, n2) = groups
+    else:
+        n1 = st.number_input("Sample size group 1 (n₁)", min_value=1, value=100)
+        x1 = st.number_input("Successes group 1 (X₁)", min_value=0, value=30)
+        n2 = st.number_input("Sample size group 2 (n₂)", min_value=1, value=120)
+        x2 = st.number_input("Successes group 2 (X₂)", min_value=0, value=20)
 with col2:
     conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
 
 p1_hat, p2_hat = x1/n1, x2/n2
 diff = p1_hat - p2_hat
 alpha = 1 - conf/100
-z_star = norm.ppf(1 - alpha/2)
+z_star = critical_value(alpha, "two")
 SE = math.sqrt(p1_hat*(1-p1_hat)/n1 + p2_hat*(1-p2_hat)/n2)
 lo = diff - z_star*SE
 hi = diff + z_star*SE
@@ -127,14 +135,16 @@ st.latex(
 )
 
 # Visualize
-fig2, ax2 = plt.subplots(figsize=(6, 1.6))
-ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax2.plot(diff, 1, "o", color="tab:blue")
-ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
-ax2.set_xlim(-0.5, 0.5)
-ax2.set_yticks([])
-ax2.set_xlabel("Difference in proportions")
-ax2.set_title(f"{conf}% CI for difference in proportions")
-ax2.grid(axis="x", alpha=0.25)
-st.pyplot(fig2)
+with phase("build plot: practice interval"):
+    fig2, ax2 = plt.subplots(figsize=(6, 1.6))
+    ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax2.plot(diff, 1, "o", color="tab:blue")
+    ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
+    lim = max(0.5, 1.2 * max(abs(lo), abs(hi)))  # dataset differences can be far outside ±0.5
+    ax2.set_xlim(-lim, lim)
+    ax2.set_yticks([])
+    ax2.set_xlabel("Difference in proportions")
+    ax2.set_title(f"{conf}% CI for difference in proportions")
+    ax2.grid(axis="x", alpha=0.25)
+pyplot(fig2)
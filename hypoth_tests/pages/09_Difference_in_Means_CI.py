@@ -3,7 +3,7 @@ import math
 import matplotlib.pyplot as plt
 import streamlit as st
 import numpy as np
-from scipy.stats import t
+from utils import *
 
 st.set_page_config(page_title="Difference in Means Confidence Interval", layout="centered")
 st.title("Difference in Means Confidence Interval")
@@ -57,7 +57,7 @@ SE = math.sqrt((s1**2)/n1 + (s2**2)/n2)
 df = ((s1**2/n1 + s2**2/n2)**2) / ((s1**2/n1)**2/(n1-1) + (s2**2/n2)**2/(n2-1))
 conf = 95
 alpha = 1 - conf/100
-t_star = t.ppf(1 - alpha/2, df)
+t_star = critical_value(alpha, "two", df)
 lo = diff - t_star*SE
 hi = diff + t_star*SE
 
@@ -73,17 +73,18 @@ st.latex(
 )
 
 # Visualization
-fig, ax = plt.subplots(figsize=(6, 1.6))
-ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax.plot(diff, 1, "o", color="tab:blue")
-ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
-ax.set_xlim(-2, 2)
-ax.set_yticks([])
-ax.set_xlabel("Difference in means")
-ax.set_title(f"{conf}% CI for difference in means (df≈{df:.1f})")
-ax.grid(axis="x", alpha=0.25)
-st.pyplot(fig)
+with phase("build plot: example interval"):
+    fig, ax = plt.subplots(figsize=(6, 1.6))
+    ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax.plot(diff, 1, "o", color="tab:blue")
+    ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
+    ax.set_xlim(-2, 2)
+    ax.set_yticks([])
+    ax.set_xlabel("Difference in means")
+    ax.set_title(f"{conf}% CI for difference in means (df≈{df:.1f})")
+    ax.grid(axis="x", alpha=0.25)
+pyplot(fig)
 
 st.info(
     f"We are {conf}% confident that the true difference in means (male minus female sleep) "
@@ -98,22 +99,32 @@ st.info(
 st.divider()
 st.subheader("Practice: Difference in Means CI")
 
+source = st.radio("Data", ["Type summary statistics", "Use a dataset"], horizontal=True, key="ci2_source")
 col1, col2 = st.columns(2)
 with col1:
-    n1 = st.number_input("Sample size group 1 (n₁)", min_value=2, value=15)
-    xbar1 = st.number_input("Sample mean group 1 (x̄₁)", value=6.2)
-    s1 = st.number_input("Sample std dev group 1 (s₁)", value=0.9)
-    n2 = st.number_input("Sample size group 2 (n₂)", min_value=2, value=18)
+    if source == "Use a dataset":
+        groups = two_group_picker("ci2", with_values=True)
+        if groups is None:
+            st.stop()
+        (_, m1, values1), (_, m2, values2) = groups
+        n1, xbar1, s1 = m1.n, m1.mean, m1.sd
+        n2, xbar2, s2 = m2.n, m2.mean, m2.sd
+    else:
+        n1 = st.number_input("Sample size group 1 (n₁)", min_value=2, value=15)
+        xbar1 = st.number_input("Sample mean group 1 (x̄₁)", value=6.2)
+        s1 = st.number_input("Sample std dev group 1 (s₁)", value=0.9)
+        n2 = st.number_input("Sample size group 2 (n₂)", min_value=2, value=18)
 with col2:
-    xbar2 = st.number_input("Sample mean group 2 (x̄₂)", value=6.8)
-    s2 = st.number_input("Sample std dev group 2 (s₂)", value=0.7)
+    if source != "Use a dataset":
+        xbar2 = st.number_input("Sample mean group 2 (x̄₂)", value=6.8)
+        s2 = st.number_input("Sample std dev group 2 (s₂)", value=0.7)
     conf = st.slider("Confidence level (%)", 80, 99, 95, step=1)
 
 diff = xbar1 - xbar2
 SE = math.sqrt((s1**2)/n1 + (s2**2)/n2)
 df = ((s1**2/n1 + s2**2/n2)**2) / ((s1**2/n1)**2/(n1-1) + (s2**2/n2)**2/(n2-1))
 alpha = 1 - conf/100
-t_star = t.ppf(1 - alpha/2, df)
+t_star = critical_value(alpha, "two", df)
 lo = diff - t_star*SE
 hi = diff + t_star*SE
 
@@ -126,14 +137,24 @@ st.latex(
 )
 
 # Visualize
-fig2, ax2 = plt.subplots(figsize=(6, 1.6))
-ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax2.plot(diff, 1, "o", color="tab:blue")
-ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
-ax2.set_xlim(-2, 2)
-ax2.set_yticks([])
-ax2.set_xlabel("Difference in means")
-ax2.set_title(f"{conf}% CI for difference in means (df≈{df:.1f})")
-ax2.grid(axis="x", alpha=0.25)
-st.pyplot(fig2)
+with phase("build plot: practice interval"):
+    fig2, ax2 = plt.subplots(figsize=(6, 1.6))
+    ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax2.plot(diff, 1, "o", color="tab:blue")
+    ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
+    lim = max(2, 1.2 * max(abs(lo), abs(hi)))  # dataset differences can be far outside ±2
+    ax2.set_xlim(-lim, lim)
+    ax2.set_yticks([])
+    ax2.set_xlabel("Difference in means")
+    ax2.set_title(f"{conf}% CI for difference in means (df≈{df:.1f})")
+    ax2.grid(axis="x", alpha=0.25)
+pyplot(fig2)
+
+if source == "Use a dataset":
+    with st.expander("Bootstrap intervals from the raw data"):
+        st.write(
+            "Each bootstrap resample draws group 1 and group 2 separately, with replacement, and records "
+            "$\\bar x_1 - \\bar x_2$. The spread of those differences replaces the t model."
+        )
+        bootstrap_panel((values1, values2), conf, (lo, hi), "ci2", "Resampled x̄₁ − x̄₂")
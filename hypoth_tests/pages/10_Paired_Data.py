@@ -60,8 +60,8 @@ mu_d0 = 0
 df = n - 1
 t_obs = (dbar - mu_d0) / (sd / np.sqrt(n))
 alpha = 0.05
-p_value = 1 - t.cdf(t_obs, df)  # right-tailed
-tcrit = t.ppf(1 - alpha, df)
+p_value = tail_prob(t_obs, "right", df)  # right-tailed
+tcrit = critical_value(alpha, "right", df)
 
 st.latex(
     r"t = \frac{0.6 - 0}{0.5/\sqrt{10}} \approx "
@@ -69,33 +69,33 @@ st.latex(
 )
 
 # Plot
-x = np.linspace(-4, 4, 400)
-y = t.pdf(x, df)
-
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label=f"t-dist (df={df})")
-
-# Shade rejection region
-xx = np.linspace(tcrit, 4, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red', label="Rejection Region")
-
-# Draw observed t
-ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
-ax.axvline(tcrit, color='pink', linestyle='--', label=f"Critical t = {tcrit:.2f}")
-
-# Annotate
-ax.annotate(
-    f"P-value = {p_value:.3f}",
-    xy=(t_obs, t.pdf(t_obs, df)),
-    xytext=(t_obs+0.5, 0.05),
-    arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
-)
-
-ax.set_title("Right-Tailed Paired t-Test Example")
-ax.set_xlabel("t")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+g = curve_grid(df, -4, 4)
+x, y = g.x, g.pdf
+
+with phase("build plot: right-tail example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label=f"t-dist (df={df})")
+
+    # Shade rejection region
+    ax.fill_between(*g.region(tcrit, 4), alpha=0.4, color='red', label="Rejection Region")
+
+    # Draw observed t
+    ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
+    ax.axvline(tcrit, color='pink', linestyle='--', label=f"Critical t = {tcrit:.2f}")
+
+    # Annotate
+    ax.annotate(
+        f"P-value = {p_value:.3f}",
+        xy=(t_obs, t.pdf(t_obs, df)),
+        xytext=(t_obs+0.5, 0.05),
+        arrowprops=dict(facecolor="black", shrink=0.05, width=1, headwidth=8)
+    )
+
+    ax.set_title("Right-Tailed Paired t-Test Example")
+    ax.set_xlabel("t")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
 Based on our standardized statistic ($t = {t_obs:.2f}$ with df={df}), the p-value is about {p_value:.3f}.  
@@ -116,29 +116,28 @@ st.latex(r"""\begin{align*}
     H_A &: \mu_d \neq 0
 \end{align*}""")
 
-p_value_two = 2*(1 - t.cdf(abs(t_obs), df))
-tcrit_two = t.ppf(1 - alpha/2, df)
+p_value_two = tail_prob(t_obs, "two", df)
+tcrit_two = critical_value(alpha, "two", df)
 
 # Plot
-x = np.linspace(-4, 4, 400)
-y = t.pdf(x, df)
-fig, ax = plt.subplots()
-ax.plot(x, y, 'b', label=f"t-dist (df={df})")
-
-xx = np.linspace(tcrit_two, 4, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red', label="Rejection Regions")
-xx = np.linspace(-4, -tcrit_two, 200)
-ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, color='red')
-
-ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
-ax.axvline(tcrit_two, color='pink', linestyle='--', label=f"Critical t = ±{tcrit_two:.2f}")
-ax.axvline(-tcrit_two, color='pink', linestyle='--')
-
-ax.set_title("Two-Sided Paired t-Test Example")
-ax.set_xlabel("t")
-ax.set_ylabel("Density")
-ax.legend(loc="upper right")
-st.pyplot(fig)
+g = curve_grid(df, -4, 4)
+x, y = g.x, g.pdf
+with phase("build plot: two-sided example"):
+    fig, ax = plt.subplots()
+    ax.plot(x, y, 'b', label=f"t-dist (df={df})")
+
+    ax.fill_between(*g.region(tcrit_two, 4), alpha=0.4, color='red', label="Rejection Regions")
+    ax.fill_between(*g.region(-4, -tcrit_two), alpha=0.4, color='red')
+
+    ax.axvline(t_obs, color='green', linestyle='--', label=f"Observed t = {t_obs:.2f}")
+    ax.axvline(tcrit_two, color='pink', linestyle='--', label=f"Critical t = ±{tcrit_two:.2f}")
+    ax.axvline(-tcrit_two, color='pink', linestyle='--')
+
+    ax.set_title("Two-Sided Paired t-Test Example")
+    ax.set_xlabel("t")
+    ax.set_ylabel("Density")
+    ax.legend(loc="upper right")
+pyplot(fig)
 
 st.write(f"""
 For a two-sided test, the p-value is about {p_value_two:.3f}.  
@@ -151,11 +150,19 @@ We would {"reject" if p_value_two < alpha else "fail to reject"} $H_0$ at $\\alp
 st.divider()
 st.subheader("Practice: Paired t-Test")
 
+source = st.radio("Data", ["Type summary statistics", "Use a dataset"], horizontal=True, key="pd_source")
+paired = None
 col1, col2 = st.columns(2)
 with col1:
-    n = st.number_input("Number of pairs (n)", min_value=2, value=10)
-    dbar = st.number_input("Sample mean difference (d̄)", value=0.6)
-    sd = st.number_input("Sample std dev of differences (s_d)", value=0.5)
+    if source == "Use a dataset":
+        paired = paired_picker("pd")
+        if paired is None:
+            st.stop()
+        n, dbar, sd = paired.moments.n, paired.moments.mean, paired.moments.sd
+    else:
+        n = st.number_input("Number of pairs (n)", min_value=2, value=10)
+        dbar = st.number_input("Sample mean difference (d̄)", value=0.6)
+        sd = st.number_input("Sample std dev of differences (s_d)", value=0.5)
     mu_d0 = st.number_input("Null mean difference (μ_d₀)", value=0.0)
 with col2:
     tail = tail_choice()
@@ -165,12 +172,7 @@ with col2:
 df = n - 1
 t_obs = (dbar - mu_d0) / (sd / np.sqrt(n))
 
-if tail == "right":
-    pval = 1 - t.cdf(t_obs, df)
-elif tail == "left":
-    pval = t.cdf(t_obs, df)
-else:
-    pval = 2*min(t.cdf(t_obs, df), 1 - t.cdf(t_obs, df))
+pval = tail_prob(t_obs, tail, df)
 
 st.latex(
     f"\\bar d = {dbar:.3f},\\ "
@@ -181,9 +183,20 @@ st.latex(
     f"\\text{{p-value}}={pval:.3f}"
 )
 
+if paired is not None:
+    plot_differences(paired)
 plot_t_test(t_obs, alpha, tail, df)
 (st.success if pval < alpha else st.warning)("Reject H₀" if pval < alpha else "Fail to reject H₀")
 
+if paired is not None:
+    with st.expander("Randomization test: flip the signs of the differences"):
+        st.write(
+            "If $H_0$ is true, each pair's difference (after subtracting $\\mu_{d,0}$) is as likely to be negative as "
+            "positive. Flipping the signs at random, or trying every combination when there are few pairs, shows how "
+            "unusual our mean difference is without a t model."
+        )
+        sign_flip_panel(paired, mu_d0, tail, alpha, "pd")
+
 
 st.divider()
 
@@ -236,7 +249,7 @@ sd = 0.5
 df = n - 1
 conf = 95
 alpha = 1 - conf/100
-t_star = t.ppf(1 - alpha/2, df)
+t_star = critical_value(alpha, "two", df)
 SE = sd / math.sqrt(n)
 lo = dbar - t_star*SE
 hi = dbar + t_star*SE
@@ -252,17 +265,18 @@ st.latex(
 )
 
 # Visualization
-fig, ax = plt.subplots(figsize=(6, 1.6))
-ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax.plot(dbar, 1, "o", color="tab:blue")
-ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
-ax.set_xlim(-0.5, 1.5)
-ax.set_yticks([])
-ax.set_xlabel("Mean difference (After − Before)")
-ax.set_title(f"{conf}% CI for paired mean difference (df={df})")
-ax.grid(axis="x", alpha=0.25)
-st.pyplot(fig)
+with phase("build plot: example interval"):
+    fig, ax = plt.subplots(figsize=(6, 1.6))
+    ax.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax.plot(dbar, 1, "o", color="tab:blue")
+    ax.axvline(0, color="black", linestyle="--", alpha=0.7)  # line at 0
+    ax.set_xlim(-0.5, 1.5)
+    ax.set_yticks([])
+    ax.set_xlabel("Mean difference (After − Before)")
+    ax.set_title(f"{conf}% CI for paired mean difference (df={df})")
+    ax.grid(axis="x", alpha=0.25)
+pyplot(fig)
 
 st.info(
     f"We are {conf}% confident that the true mean difference lies between {lo:.3f} and {hi:.3f}. "
@@ -278,15 +292,21 @@ st.subheader("Practice: Paired Data CI")
 
 col1, col2 = st.columns(2)
 with col1:
-    n = st.number_input("Number of pairs (n)", min_value=2, value=10, key="ci_n")
-    dbar = st.number_input("Sample mean of differences (d̄)", value=0.6, step=0.1, key="ci_dbar")
+    if paired is not None:
+        # same differences as the paired t-test practice above
+        n, dbar, sd = paired.moments.n, paired.moments.mean, paired.moments.sd
+        st.caption(f"Using the differences from `{paired.name}.csv` chosen above ({paired.label}).")
+    else:
+        n = st.number_input("Number of pairs (n)", min_value=2, value=10, key="ci_n")
+        dbar = st.number_input("Sample mean of differences (d̄)", value=0.6, step=0.1, key="ci_dbar")
 with col2:
-    sd = st.number_input("Sample std dev of differences (s_d)", value=0.5, step=0.1, key="ci_sd")
+    if paired is None:
+        sd = st.number_input("Sample std dev of differences (s_d)", value=0.5, step=0.1, key="ci_sd")
     conf = st.slider("Confidence level (%)", 80, 99, 95, step=1, key="ci_conf")
 
 df = n - 1
 alpha = 1 - conf/100
-t_star = t.ppf(1 - alpha/2, df)
+t_star = critical_value(alpha, "two", df)
 SE = sd / math.sqrt(n)
 lo = dbar - t_star*SE
 hi = dbar + t_star*SE
@@ -300,14 +320,23 @@ st.latex(
 )
 
 # Visualize
-fig2, ax2 = plt.subplots(figsize=(6, 1.6))
-ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
-ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
-ax2.plot(dbar, 1, "o", color="tab:blue")
-ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
-ax2.set_xlim(lo-0.5, hi+0.5)
-ax2.set_yticks([])
-ax2.set_xlabel("Mean difference (After − Before)")
-ax2.set_title(f"{conf}% CI for paired mean difference (df={df})")
-ax2.grid(axis="x", alpha=0.25)
-st.pyplot(fig2)
+with phase("build plot: practice interval"):
+    fig2, ax2 = plt.subplots(figsize=(6, 1.6))
+    ax2.hlines(1, lo, hi, color="tab:red", linewidth=4)
+    ax2.plot([lo, hi], [1, 1], "o", color="tab:red")
+    ax2.plot(dbar, 1, "o", color="tab:blue")
+    ax2.axvline(0, color="black", linestyle="--", alpha=0.7)
+    ax2.set_xlim(lo-0.5, hi+0.5)
+    ax2.set_yticks([])
+    ax2.set_xlabel("Mean difference (After − Before)")
+    ax2.set_title(f"{conf}% CI for paired mean difference (df={df})")
+    ax2.grid(axis="x", alpha=0.25)
+pyplot(fig2)
+
+if paired is not None:
+    with st.expander("Bootstrap intervals from the differences"):
+        st.write(
+            "Paired data are bootstrapped by resampling whole pairs, that is, the differences, with replacement. "
+            "The spread of the resampled mean differences replaces the t model."
+        )
+        bootstrap_panel((paired.d,), conf, (lo, hi), "ci", "Resampled d̄")
@@ -0,0 +1,521 @@
+# simulation.py
+"""Randomization tests for the hypothesis-test pages.
+
+Pure NumPy, no Streamlit, so the engines can be timed and reused outside the
+app. Random draws are made in blocks sized to a memory budget, and every
+engine takes a `seed`, so the same seed reproduces the same p-value.
+
+Monte Carlo p-values use the (hits + 1) / (draws + 1) estimate, which never
+reports an impossible p = 0. Engines that stop early do so once a Wilson
+band around hits / draws lies entirely on one side of α.
+"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+# working-memory cap for one block of random draws
+SIM_MEM_BUDGET = 64 * 2**20
+# bytes per pooled value per permutation: a float64 sort key plus an int64 index
+_BYTES_PER_KEY = 16
+# bytes held per resampled value: one int64 index + one float64 sample
+BYTES_PER_DRAW = 16
+# reps per SeedSequence child in run_pooled; fixed so the block layout (and
+# therefore the output) does not depend on the worker count
+POOL_BLOCK_REPS = 50_000
+# draws per block for the count-valued (hypergeometric, binomial) null simulators
+COUNT_BATCH = 1_000_000
+# sign-flip test: enumerate exactly while 2**(n-1) flips fit this cap. A Gray-code
+# step costs ~30-55 ns and a Monte Carlo draw ~170-230 ns (n = 25-50, one core),
+# so the cap (n <= 25) keeps the exact walk under a second; past it, 100k
+# Monte Carlo draws (~20 ms) are far cheaper than doubling the walk per pair
+EXACT_MAX_FLIPS = 2**24
+# Gray-code steps per vectorized chunk
+_GRAY_CHUNK = 2**20
+# bins of the sign-flip null histogram
+SIGN_FLIP_BINS = 81
+
+# run_pooled's process pool, kept for the life of the process: (workers, executor)
+_POOL = None
+_POOL_LOCK = threading.Lock()
+# shared segment a pool worker has mapped: (SharedMemory, array view)
+_WORKER_SHM = None
+
+def _pool(workers):
+    """The process pool shared by every run_pooled call, rebuilt when `workers` changes."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL[0] != workers:
+            if _POOL is not None:
+                _POOL[1].shutdown(wait=False)
+            # spawned workers import only this module (NumPy), not the app
+            ctx = multiprocessing.get_context("spawn")
+            _POOL = (workers, ProcessPoolExecutor(workers, mp_context=ctx))
+        return _POOL[1]
+
+def _drop_pool(ex):
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL[1] is ex:
+            _POOL = None
+    ex.shutdown(wait=False)
+
+def _attach_shared(shm_name, shape, dtype):
+    """Map the parent's shared array in a pool worker, keeping only the latest segment open."""
+    global _WORKER_SHM
+    if _WORKER_SHM is None or _WORKER_SHM[0].name != shm_name:
+        if _WORKER_SHM is not None:
+            shm = _WORKER_SHM[0]
+            _WORKER_SHM = None  # drop the view before closing its buffer
+            shm.close()
+        # children share the parent's resource tracker, which unlinks the segment
+        # only if the parent never does
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER_SHM = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    return _WORKER_SHM[1]
+
+def _run_block(block_fn, seed_seq, reps, args, shared_ref):
+    if shared_ref is None:
+        return block_fn(seed_seq, reps, *args)
+    return block_fn(seed_seq, reps, *args, shared=_attach_shared(*shared_ref))
+
+def run_pooled(block_fn, reps, seed, workers, args=(), shared=None):
+    """Results of block_fn(seed_seq, block_reps, *args) over fixed POOL_BLOCK_REPS blocks.
+
+    Each block gets its own SeedSequence(seed) child and up to `workers`
+    processes run them. `shared`, if given, reaches block_fn as the `shared=`
+    keyword; pool workers map it from shared memory instead of unpickling it.
+    block_fn must be defined in this module so workers never import the app.
+    """
+    sizes = [min(POOL_BLOCK_REPS, reps - start) for start in range(0, reps, POOL_BLOCK_REPS)]
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = max(1, min(int(workers), len(sizes), os.cpu_count() or 1))
+
+    if workers == 1:
+        extra = {} if shared is None else dict(shared=shared)
+        return [block_fn(ss, m, *args, **extra) for ss, m in zip(children, sizes)]
+    ex = _pool(workers)
+    k = len(sizes)
+    shm = None
+    try:
+        if shared is None:
+            ref = None
+        else:
+            shared = np.ascontiguousarray(shared)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, shared.nbytes))
+            np.ndarray(shared.shape, dtype=shared.dtype, buffer=shm.buf)[...] = shared
+            ref = (shm.name, shared.shape, shared.dtype.str)
+        return list(ex.map(_run_block, [block_fn] * k, children, sizes, [args] * k, [ref] * k))
+    except BrokenProcessPool:
+        _drop_pool(ex)
+        raise
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+def resampled_stats(rng, pop, n, reps, mem_budget=None):
+    """(x̄, s/√n) of `reps` samples of size n drawn from pop, in blocks that fit `mem_budget` bytes."""
+    if mem_budget is None:
+        block = max(1, reps)
+    else:
+        block = max(1, int(mem_budget) // (BYTES_PER_DRAW * n))
+
+    xbar = np.empty(reps)
+    se = np.empty(reps)
+    for start in range(0, reps, block):
+        stop = min(reps, start + block)
+        # vectorized bootstrap
+        idx = rng.integers(0, pop.size, size=(stop - start, n))
+        samples = pop[idx]
+        xbar[start:stop] = samples.mean(axis=1)
+        se[start:stop] = samples.std(axis=1, ddof=1) / np.sqrt(n)
+        del idx, samples
+    return xbar, se
+
+def _resampled_stats_block(seed_seq, reps, n, mem_budget, shared):
+    return resampled_stats(np.random.default_rng(seed_seq), shared, n, reps, mem_budget)
+
+def pooled_resampled_stats(pop, n, reps, seed, mem_budget=None, workers=1):
+    """resampled_stats over run_pooled's blocks, with `pop` in shared memory; independent of `workers`."""
+    parts = run_pooled(_resampled_stats_block, reps, seed, workers, args=(n, mem_budget), shared=pop)
+    if not parts:
+        return np.empty(0), np.empty(0)
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+def mc_band(hits, draws, conf=0.99):
+    """Wilson interval for the true p-value after `hits` extreme draws out of `draws`."""
+    if draws == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + conf / 2)
+    p = hits / draws
+    denom = 1 + z * z / draws
+    center = (p + z * z / (2 * draws)) / denom
+    half = z * math.sqrt(p * (1 - p) / draws + z * z / (4 * draws * draws)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+def _extreme(stat, observed, tail):
+    """How many of `stat` are at least as extreme as `observed` (with a float tolerance)."""
+    tol = 1e-9 * max(1.0, abs(observed))
+    if tail == "right":
+        return int(np.count_nonzero(stat >= observed - tol))
+    if tail == "left":
+        return int(np.count_nonzero(stat <= observed + tol))
+    return int(np.count_nonzero(np.abs(stat) >= abs(observed) - tol))
+
+class PermutationResult(NamedTuple):
+    """Outcome of a Monte Carlo randomization test."""
+    observed: float
+    p_value: float
+    draws: int
+    hits: int
+    band: tuple
+    stopped_early: bool
+    null: np.ndarray  # the simulated statistics, in draw order
+
+def permutation_test(x, y, tail="two", alpha=0.05, max_perms=100_000, seed=None,
+                     mem_budget=SIM_MEM_BUDGET, band_conf=0.99, min_perms=2_000):
+    """Permutation test of equal means for two independent samples.
+
+    The statistic is x̄ − ȳ. Each permutation only picks which pooled values
+    land in the smaller group (argpartition of random keys) and sums them;
+    the other group's sum is the pooled total minus that, so no permuted
+    sample is ever re-averaged. Permutations run in blocks that fit
+    `mem_budget`, and the test stops after any block (once `min_perms` are
+    done) whose band_conf Monte Carlo band for the p-value excludes α.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n1, n2 = x.size, y.size
+    if n1 < 1 or n2 < 1:
+        raise ValueError("both groups need at least one value")
+    pooled = np.concatenate([x, y])
+    total, size = pooled.sum(), pooled.size
+    k = min(n1, n2)
+    observed = float(x.mean() - y.mean())
+
+    rng = np.random.default_rng(seed)
+    block = max(1, min(int(max_perms), int(mem_budget) // (_BYTES_PER_KEY * size)))
+    null = np.empty(int(max_perms))
+    hits = draws = 0
+    stopped = False
+    while draws < max_perms:
+        b = min(block, max_perms - draws)
+        keys = rng.random((b, size))
+        picked = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        s = pooled[picked].sum(axis=1)
+        s1 = s if n1 <= n2 else total - s
+        stat = s1 / n1 - (total - s1) / n2
+        null[draws:draws + b] = stat
+        hits += _extreme(stat, observed, tail)
+        draws += b
+        del keys, picked
+        lo, hi = mc_band(hits, draws, band_conf)
+        if draws >= min_perms and (hi < alpha or lo > alpha):
+            stopped = draws < max_perms
+            break
+
+    return PermutationResult(observed, (hits + 1) / (draws + 1), draws, hits,
+                             mc_band(hits, draws, band_conf), stopped, null[:draws])
+
+class CountHistogram:
+    """Running counts of integer draws on lo..hi.
+
+    Each batch is folded in with np.bincount and then dropped, so memory is
+    one counter per possible value however many draws are added.
+    """
+
+    def __init__(self, lo, hi):
+        self.lo, self.hi = int(lo), int(hi)
+        self.counts = np.zeros(self.hi - self.lo + 1, dtype=np.int64)
+
+    @property
+    def values(self):
+        return np.arange(self.lo, self.hi + 1)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def add(self, draws):
+        self.counts += np.bincount(np.asarray(draws) - self.lo, minlength=self.counts.size)
+
+    def p_value_where(self, extreme):
+        """Monte Carlo p-value for a precomputed mask of extreme values (one per value lo..hi)."""
+        return (int(self.counts[extreme].sum()) + 1) / (self.total + 1)
+
+def hypergeometric_null(n1, n2, successes, draws, seed=None, batch=COUNT_BATCH):
+    """Yield a CountHistogram of group-1 success counts under H₀: π₁ = π₂, after each batch.
+
+    Given both group sizes and the pooled number of successes, shuffling the
+    rows' group labels leaves group 1 with a hypergeometric number of
+    successes, so one rng.hypergeometric draw replaces one full shuffle.
+    """
+    rng = np.random.default_rng(seed)
+    hist = CountHistogram(max(0, successes - n2), min(successes, n1))
+    done = 0
+    while done < draws:
+        b = min(batch, draws - done)
+        hist.add(rng.hypergeometric(successes, n1 + n2 - successes, n1, size=b))
+        done += b
+        yield hist
+
+def binomial_null(n, p0, draws, seed=None, batch=COUNT_BATCH):
+    """Yield a CountHistogram of success counts X ~ Binomial(n, p0) after each batch."""
+    rng = np.random.default_rng(seed)
+    hist = CountHistogram(0, n)
+    done = 0
+    while done < draws:
+        b = min(batch, draws - done)
+        hist.add(rng.binomial(n, p0, size=b))
+        done += b
+        yield hist
+
+# log k! for k = 0 .. len - 1, grown on demand and shared by every caller
+_LOG_FACT = np.zeros(1)
+_LOG_FACT_LOCK = threading.Lock()
+
+def log_factorials(n):
+    """Read-only table of log k! with at least n + 1 entries."""
+    global _LOG_FACT
+    table = _LOG_FACT
+    if table.size > n:
+        return table
+    with _LOG_FACT_LOCK:
+        if _LOG_FACT.size <= n:
+            size = max(n + 1, 2 * _LOG_FACT.size, 1024)
+            table = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, size)))))
+            table.setflags(write=False)
+            _LOG_FACT = table
+        return _LOG_FACT
+
+def _hypergeometric_log_pmf(n1, n2, k):
+    n = n1 + n2
+    lf = log_factorials(n)
+    v = np.arange(max(0, k - n2), min(k, n1) + 1)
+    return (lf[k] - lf[v] - lf[k - v] + lf[n - k] - lf[n1 - v] - lf[n - k - n1 + v]
+            - lf[n] + lf[n1] + lf[n - n1])
+
+def fisher_extreme(x1, n1, x2, n2, tail="two"):
+    """Boolean mask over group-1 counts max(0, k-n2)..min(k, n1) at least as extreme as x1.
+
+    Two-sided, that is every count no more likely than x1, so a simulated
+    p-value over the same mask converges to fisher_exact.
+    """
+    k = x1 + x2
+    v = np.arange(max(0, k - n2), min(k, n1) + 1)
+    if tail == "right":
+        return v >= x1
+    if tail == "left":
+        return v <= x1
+    log_pmf = _hypergeometric_log_pmf(n1, n2, k)
+    return log_pmf <= log_pmf[x1 - v[0]] + 1e-7
+
+def fisher_exact(x1, n1, x2, n2, tail="two"):
+    """Exact conditional (Fisher) p-value for π₁ = π₂ from two binomial counts.
+
+    The hypergeometric pmf of every possible group-1 count comes from the
+    cached log-factorial table in one vectorized pass.
+    """
+    pmf = np.exp(_hypergeometric_log_pmf(n1, n2, x1 + x2))
+    return float(min(1.0, pmf[fisher_extreme(x1, n1, x2, n2, tail)].sum()))
+
+class SignFlipResult(NamedTuple):
+    """Outcome of a sign-flip test; the null is kept as a histogram of d̄."""
+    observed: float
+    p_value: float
+    draws: int
+    exact: bool
+    band: tuple
+    stopped_early: bool
+    counts: np.ndarray
+    edges: np.ndarray
+
+def _gray_sums(d, start, stop, s_prev):
+    """Running sums Σ sᵢdᵢ for Gray codes start..stop-1, given the sum at start-1.
+
+    Step t flips bit j = ctz(t), which adds 2dⱼ when the bit clears and
+    subtracts it when the bit sets, so each sum costs one term.
+    """
+    t = np.arange(start, stop, dtype=np.int64)
+    j = np.frexp((t & -t).astype(float))[1] - 1
+    now_set = ((t ^ (t >> 1)) >> j) & 1
+    return s_prev + np.cumsum(np.where(now_set == 1, -2.0, 2.0) * d[j])
+
+def sign_flip_test(d, mu0=0.0, tail="two", alpha=0.05, max_draws=100_000, seed=None,
+                   mem_budget=SIM_MEM_BUDGET, band_conf=0.99, min_draws=2_000, exact=None):
+    """Randomization test of μ_d = mu0 on paired differences by flipping their signs.
+
+    Under H₀ each centered difference dᵢ − mu0 is as likely to be negative as
+    positive. With 2**(n-1) <= EXACT_MAX_FLIPS (or exact=True) every sign
+    pattern is enumerated: a Gray-code walk over the patterns that keep the
+    last sign fixed, each mirrored by its all-flipped twin, covers all 2**n.
+    Otherwise random sign patterns are drawn in blocks with the same early
+    stopping as permutation_test.
+    """
+    d = np.asarray(d, dtype=float) - mu0
+    n = d.size
+    if n < 1:
+        raise ValueError("need at least one difference")
+    observed = float(d.sum())
+    tol = 1e-9 * max(1.0, float(np.abs(d).sum()))
+    reach = max(float(np.abs(d).sum()), tol)
+    edges = np.linspace(-reach, reach, SIGN_FLIP_BINS + 1)
+    counts = np.zeros(SIGN_FLIP_BINS, dtype=np.int64)
+
+    def tally(sums, mirror=False):
+        # mirror=True also counts -sums, the all-flipped twins (the bins are symmetric)
+        bins = np.clip(((sums + reach) * (SIGN_FLIP_BINS / (2 * reach))).astype(np.intp), 0, SIGN_FLIP_BINS - 1)
+        c = np.bincount(bins, minlength=SIGN_FLIP_BINS)
+        counts[:] += c + c[::-1] if mirror else c
+        if tail == "two":
+            return (1 + mirror) * int(np.count_nonzero(np.abs(sums) >= abs(observed) - tol))
+        sign = 1 if tail == "right" else -1
+        hits = int(np.count_nonzero(sign * sums >= sign * observed - tol))
+        if mirror:
+            hits += int(np.count_nonzero(-sign * sums >= sign * observed - tol))
+        return hits
+
+    if exact is None:
+        exact = 2 ** (n - 1) <= EXACT_MAX_FLIPS
+    if exact:
+        half = 2 ** (n - 1)
+        hits, s_prev = 0, observed
+        for start in range(0, half, _GRAY_CHUNK):
+            if start == 0:
+                sums = np.concatenate(([observed], _gray_sums(d, 1, min(half, _GRAY_CHUNK), observed)))
+            else:
+                sums = _gray_sums(d, start, min(half, start + _GRAY_CHUNK), s_prev)
+            s_prev = sums[-1]
+            hits += tally(sums, mirror=True)
+        p = hits / (2 * half)
+        return SignFlipResult(observed / n, p, 2 * half, True, (p, p), False, counts, edges / n)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, min(int(max_draws), int(mem_budget) // (_BYTES_PER_KEY * n)))
+    hits = draws = 0
+    stopped = False
+    while draws < max_draws:
+        b = min(block, max_draws - draws)
+        negative = rng.random((b, n)) < 0.5
+        hits += tally(observed - 2 * (negative @ d))
+        draws += b
+        lo, hi = mc_band(hits, draws, band_conf)
+        if draws >= min_draws and (hi < alpha or lo > alpha):
+            stopped = draws < max_draws
+            break
+    return SignFlipResult(observed / n, (hits + 1) / (draws + 1), draws, False,
+                          mc_band(hits, draws, band_conf), stopped, counts, edges / n)
+
+class BootstrapResult(NamedTuple):
+    """Bootstrap intervals for a mean or a difference of means."""
+    estimate: float
+    reps: int
+    percentile: tuple
+    basic: tuple
+    bca: tuple
+    bias: float  # z₀
+    accel: float  # a
+    stats: np.ndarray  # the bootstrap replicates
+
+def _resampled_means(rng, x, reps, mem_budget):
+    """Means of `reps` resamples of x, in index blocks that fit `mem_budget`."""
+    n = x.size
+    block = max(1, int(mem_budget) // (BYTES_PER_DRAW * n))
+    out = np.empty(reps)
+    for start in range(0, reps, block):
+        stop = min(reps, start + block)
+        idx = rng.integers(0, n, size=(stop - start, n))
+        out[start:stop] = x[idx].mean(axis=1)
+        del idx
+    return out
+
+def _bootstrap_block(seed_seq, reps, samples, mem_budget):
+    rng = np.random.default_rng(seed_seq)
+    means = [_resampled_means(rng, x, reps, mem_budget) for x in samples]
+    return means[0] if len(means) == 1 else means[0] - means[1]
+
+def _jackknife(samples):
+    """Leave-one-out estimates from running sums: O(n), no resampled arrays."""
+    if len(samples) == 1:
+        x = samples[0]
+        return (x.sum() - x) / (x.size - 1)
+    x, y = samples
+    return np.concatenate([(x.sum() - x) / (x.size - 1) - y.mean(),
+                           x.mean() - (y.sum() - y) / (y.size - 1)])
+
+def bootstrap_ci(samples, conf=95, reps=50_000, seed=None, mem_budget=SIM_MEM_BUDGET, workers=None):
+    """Percentile, basic and BCa bootstrap intervals.
+
+    samples=(x,) bootstraps the mean of x (for paired data, pass the
+    differences); samples=(x, y) bootstraps x̄ − ȳ, resampling each group
+    separately. BCa's acceleration comes from the jackknife, whose
+    leave-one-out means are (sum − xᵢ)/(n − 1).
+
+    workers=k runs the resamples through run_pooled on k processes; the
+    output depends on the seed but not on k, and differs from the
+    workers=None stream.
+    """
+    samples = tuple(np.asarray(x, dtype=float) for x in samples)
+    if len(samples) not in (1, 2) or min(x.size for x in samples) < 2:
+        raise ValueError("need one or two samples of at least two values")
+    estimate = float(samples[0].mean() - (samples[1].mean() if len(samples) == 2 else 0.0))
+
+    if workers is None:
+        stats = _bootstrap_block(np.random.SeedSequence(seed), reps, samples, mem_budget)
+    else:
+        stats = np.concatenate(run_pooled(_bootstrap_block, reps, seed, workers, args=(samples, mem_budget)))
+
+    alpha = 1 - conf / 100
+    q_lo, q_hi = np.quantile(stats, [alpha / 2, 1 - alpha / 2])
+    normal = NormalDist()
+    # bias correction: where the estimate falls among the replicates (ties count half)
+    below = (np.count_nonzero(stats < estimate) + 0.5 * np.count_nonzero(stats == estimate)) / reps
+    z0 = normal.inv_cdf(min(max(below, 1 / (2 * reps)), 1 - 1 / (2 * reps)))
+    jack = _jackknife(samples)
+    dev = jack.mean() - jack
+    denom = 6 * float((dev ** 2).sum()) ** 1.5
+    accel = float((dev ** 3).sum()) / denom if denom > 0 else 0.0
+
+    def adjusted(z):
+        return normal.cdf(z0 + (z0 + z) / (1 - accel * (z0 + z)))
+
+    z_lo, z_hi = normal.inv_cdf(alpha / 2), normal.inv_cdf(1 - alpha / 2)
+    b_lo, b_hi = np.quantile(stats, [adjusted(z_lo), adjusted(z_hi)])
+    return BootstrapResult(estimate, reps, (float(q_lo), float(q_hi)),
+                           (2 * estimate - float(q_hi), 2 * estimate - float(q_lo)),
+                           (float(b_lo), float(b_hi)), z0, accel, stats)
+
+def _binomial_log_pmf(n, p0):
+    v = np.arange(n + 1)
+    if p0 <= 0 or p0 >= 1:  # point mass at 0 or n
+        return np.where(v == (0 if p0 <= 0 else n), 0.0, -np.inf)
+    lf = log_factorials(n)
+    return lf[n] - lf[v] - lf[n - v] + v * math.log(p0) + (n - v) * math.log1p(-p0)
+
+def binomial_extreme(x, n, p0, tail="two"):
+    """Boolean mask over counts 0..n of the outcomes at least as extreme as x.
+
+    Two-sided, that is every count no more likely than x (as
+    scipy.stats.binomtest does), so a simulated p-value over the same mask
+    converges to binomial_exact.
+    """
+    v = np.arange(n + 1)
+    if tail == "right":
+        return v >= x
+    if tail == "left":
+        return v <= x
+    log_pmf = _binomial_log_pmf(n, p0)
+    return log_pmf <= log_pmf[x] + 1e-7
+
+def binomial_exact(x, n, p0, tail="two"):
+    """Exact binomial p-value for π = p0, from the cached log-factorial table."""
+    pmf = np.exp(_binomial_log_pmf(n, p0))
+    return float(min(1.0, pmf[binomial_extreme(x, n, p0, tail)].sum()))
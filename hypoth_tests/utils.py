@@ -1,73 +1,584 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
+from matplotlib.ticker import MaxNLocator
 from scipy.stats import norm, t, beta
+from scipy.special import gammaln, xlogy, xlog1py
+from scipy.interpolate import CubicSpline
 import math
+import os
+import io
+import json
+import sys
+import time
+import threading
+import tracemalloc
+from collections import OrderedDict, deque
+import contextlib
+from functools import lru_cache
+from string import Template
+import datastore
+import simulation
+
+# working-memory cap for the coverage explorer's resampling blocks
+COVERAGE_MEM_BUDGET = 64 * 2**20
+# reps·n below which workers="auto" stays in-process: resampling costs about
+# 16 ns per draw, so this is roughly 0.8 s of work, against under a second to
+# spawn the pool (once per process) and ~50 ms of transfer per call
+POOL_MIN_DRAWS = 50_000_000
+
+def _sample_stats(rng, pop, n, reps, mem_budget, engine):
+    """Return (xbar, se) for `reps` simulated samples of size n."""
+    if engine == "analytic":
+        mu, sigma = float(np.mean(pop)), float(np.std(pop))
+        xbar = rng.normal(mu, sigma / np.sqrt(n), size=reps)
+        s = sigma * np.sqrt(rng.chisquare(n - 1, size=reps) / (n - 1))
+        return xbar, s / np.sqrt(n)
+    if engine != "resample":
+        raise ValueError(f"unknown engine {engine!r}; use 'resample' or 'analytic'")
+    return simulation.resampled_stats(rng, pop, n, reps, mem_budget)
+
+# --- render-phase profiling ---
+# Off unless MA206_PROFILE=1; `phase` is then a no-op. When on, every `phase` appends
+# one record to PROFILE_BUFFER (and to the JSONL file named by MA206_PROFILE_LOG, if
+# set). Allocation columns are filled only while tracemalloc is tracing
+# (MA206_PROFILE_TRACEMALLOC=1, or the toggle on the admin view). Figure counts are
+# pyplot figures opened during the phase and still open at its end; they and the
+# peaks are process-wide, so concurrent sessions can inflate each other's.
+PROFILE_ENABLED = os.environ.get("MA206_PROFILE", "0") == "1"
+PROFILE_BUFFER = deque(maxlen=int(os.environ.get("MA206_PROFILE_BUFFER", 5000)))
+PROFILE_LOG = os.environ.get("MA206_PROFILE_LOG")
+_PROFILE_LOCK = threading.Lock()
+_PROFILE_DEPTH = threading.local()
+if os.environ.get("MA206_PROFILE_TRACEMALLOC") == "1" and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _profile_page():
+    # the innermost app script (Home.py or a page) below this module on the stack;
+    # phases run from other code (e.g. inside st.cache_data) fall back to the first caller
+    f, first = sys._getframe(2), None
+    while f is not None:
+        path = f.f_code.co_filename
+        if path not in (__file__, contextlib.__file__):
+            first = first or path
+            if os.path.abspath(path).startswith(_APP_DIR + os.sep):
+                return os.path.basename(path)
+        f = f.f_back
+    return os.path.basename(first) if first else "?"
+
+def _profile_session():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+class phase(contextlib.ContextDecorator):
+    """Time a block (`with phase("build plot"):`) or a function (`@phase("compute")`).
+
+    Records wall time, figures created and, while tracemalloc is tracing, net and
+    peak allocations (KiB), tagged with the calling page and the session id.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # a fresh instance per decorated call, so threads and recursion don't share timers
+        return phase(self.name)
+
+    def __enter__(self):
+        if not PROFILE_ENABLED:
+            return self
+        depth = getattr(_PROFILE_DEPTH, "n", 0)
+        _PROFILE_DEPTH.n = depth + 1
+        self._page, self._session = _profile_page(), _profile_session()
+        self._tracing = tracemalloc.is_tracing()
+        if self._tracing:
+            if depth == 0:  # nested phases report the peak since the outermost one began
+                tracemalloc.reset_peak()
+            self._mem0 = tracemalloc.get_traced_memory()[0]
+        self._figs0 = set(plt.get_fignums())
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not PROFILE_ENABLED:
+            return False
+        wall = time.perf_counter() - self._t0
+        _PROFILE_DEPTH.n -= 1
+        rec = dict(ts=time.time(), page=self._page, session=self._session, phase=self.name,
+                   wall_ms=wall * 1e3, figures=len(set(plt.get_fignums()) - self._figs0),
+                   alloc_kb=None, peak_kb=None, error=exc[0].__name__ if exc[0] else None)
+        if self._tracing and tracemalloc.is_tracing():
+            cur, peak = tracemalloc.get_traced_memory()
+            rec["alloc_kb"], rec["peak_kb"] = (cur - self._mem0) / 1024, (peak - self._mem0) / 1024
+        with _PROFILE_LOCK:
+            PROFILE_BUFFER.append(rec)
+            if PROFILE_LOG:
+                try:
+                    with open(PROFILE_LOG, "a") as f:
+                        f.write(json.dumps(rec) + "\n")
+                except OSError:
+                    pass  # a bad log path must not break the page
+        return False
+
+def pyplot(fig, **kwargs):
+    """st.pyplot inside a "st.pyplot" phase; the figure is closed once serialized."""
+    with phase("st.pyplot"):
+        st.pyplot(fig, **kwargs)
+    plt.close(fig)
+
+def profile_summary(records=None):
+    """Per-(page, phase) count, mean/p95/max wall time (ms) and figures, slowest p95 first."""
+    if records is None:
+        with _PROFILE_LOCK:
+            records = list(PROFILE_BUFFER)
+    groups = {}
+    for r in records:
+        groups.setdefault((r["page"], r["phase"]), []).append(r)
+    rows = []
+    for (page, name), rs in groups.items():
+        wall = np.array([r["wall_ms"] for r in rs])
+        peaks = [r["peak_kb"] for r in rs if r["peak_kb"] is not None]
+        rows.append(dict(page=page, phase=name, count=len(rs), mean_ms=wall.mean(),
+                         p95_ms=np.percentile(wall, 95), max_ms=wall.max(), total_ms=wall.sum(),
+                         figures=sum(r["figures"] for r in rs),
+                         peak_kb=max(peaks) if peaks else None))
+    return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)
+
+def profile_dashboard():
+    """Admin view of PROFILE_BUFFER: slowest pages and phases, sessions and cache hit rates."""
+    st.title("Render profile")
+    with _PROFILE_LOCK:
+        records = list(PROFILE_BUFFER)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Phases recorded", f"{len(records)} / {PROFILE_BUFFER.maxlen}")
+    tracing = tracemalloc.is_tracing()
+    if c2.toggle("Trace allocations", value=tracing, help="tracemalloc slows every page while on.") != tracing:
+        tracemalloc.stop() if tracing else tracemalloc.start()
+    if c3.button("Clear buffer"):
+        with _PROFILE_LOCK:
+            PROFILE_BUFFER.clear()
+        records = []
+    if PROFILE_LOG:
+        st.caption(f"Also appending to `{PROFILE_LOG}`.")
+    if not PROFILE_ENABLED:
+        st.info("Profiling is off. Restart the app with MA206_PROFILE=1 to record phases.")
+        return
+    if not records:
+        st.info("Nothing recorded yet. Open a few pages and come back.")
+        return
+
+    rows = profile_summary(records)
+    pages = {}
+    for r in rows:  # rows come slowest p95 first, so the first row per page is its slowest phase
+        pg = pages.setdefault(r["page"], dict(page=r["page"], phases=0, total_ms=0.0,
+                                              slowest_phase=r["phase"], slowest_p95_ms=r["p95_ms"]))
+        pg["phases"] += r["count"]
+        pg["total_ms"] += r["total_ms"]
+    sessions = {}
+    for r in records:
+        ss = sessions.setdefault(r["session"], dict(session=r["session"], phases=0, total_ms=0.0, pages=set()))
+        ss["phases"] += 1
+        ss["total_ms"] += r["wall_ms"]
+        ss["pages"].add(r["page"])
+
+    st.subheader("Slowest pages")
+    st.dataframe(sorted(pages.values(), key=lambda r: r["total_ms"], reverse=True), hide_index=True)
+    st.subheader("Slowest phases")
+    st.dataframe(rows, hide_index=True)
+    st.subheader("Sessions")
+    st.dataframe([dict(s, pages=", ".join(sorted(s["pages"])))
+                  for s in sorted(sessions.values(), key=lambda s: s["total_ms"], reverse=True)],
+                 hide_index=True)
+    st.subheader("Caches")
+    st.json(dict(figures=FIGURE_CACHE.stats(), critical_values=critical_value_stats()))
+    st.subheader("Latest phases")
+    st.dataframe(records[::-1][:100], hide_index=True)
 
 # Vectorized interval generator (fast)
-def compute_intervals(pop, n, reps, conf, seed=None):
-    if seed is not None:
-        rng = np.random.default_rng(seed)
-    else:
-        rng = np.random.default_rng()
+@phase("compute_intervals")
+def compute_intervals(pop, n, reps, conf, seed=None, mem_budget=None, engine="resample", workers=None):
+    """Simulate `reps` t-intervals from samples of size n drawn from `pop`.
+
+    engine="resample" draws raw samples from `pop`. With `mem_budget` (bytes)
+    the reps are walked in blocks whose index and sample matrices fit in the
+    budget, so memory no longer grows with reps. Blocks draw from the same
+    generator in order, so seeded output is identical to the single-shot path.
+
+    engine="analytic" is for normal populations (make_pop): x̄ and s are drawn
+    straight from their sampling distributions, N(μ, σ/√n) and σ·√(χ²ₙ₋₁/(n−1)),
+    with μ and σ taken from `pop`. Cost is O(reps) instead of O(reps·n).
+
+    workers=k (resample engine only) splits the reps into fixed-size blocks
+    seeded from SeedSequence(seed).spawn(...) and runs them on k processes,
+    with `pop` shared through shared memory. Output depends on the seed but
+    not on k; it is a different stream from the default workers=None path.
+    workers="auto" uses every core once reps·n reaches POOL_MIN_DRAWS and
+    runs in-process otherwise.
+    """
     true_mean = float(np.mean(pop))
     alpha = 1 - conf/100
-    t_star = t.ppf(1 - alpha/2, df=n-1)
+    t_star = critical_value(alpha, "two", n-1)
+
+    if workers == "auto":
+        workers = os.cpu_count() if reps * n >= POOL_MIN_DRAWS else None
+    if workers is None or engine != "resample":
+        if seed is not None:
+            rng = np.random.default_rng(seed)
+        else:
+            rng = np.random.default_rng()
+        xbar, se = _sample_stats(rng, pop, n, reps, mem_budget, engine)
+    else:
+        xbar, se = simulation.pooled_resampled_stats(pop, n, reps, seed, mem_budget, workers)
 
-    # vectorized bootstrap
-    idx = rng.integers(0, pop.size, size=(reps, n))
-    samples = pop[idx]
-    xbar = samples.mean(axis=1)
-    se = samples.std(axis=1, ddof=1) / np.sqrt(n)
     lo = xbar - t_star*se
     hi = xbar + t_star*se
     hit = (lo <= true_mean) & (true_mean <= hi)
     return dict(true_mean=true_mean, xbar=xbar, lo=lo, hi=hi, hit=hit)
 
-def draw_frame(data, k, conf, n, reps, height_px=900):
-    """Draw first k intervals. Returns a matplotlib fig for st.pyplot."""
-    true_mean = data["true_mean"]
-    lo, hi, xbar, hit = data["lo"][:k], data["hi"][:k], data["xbar"][:k], data["hit"][:k]
-    y = np.arange(1, k+1)
-
-    # scale fig height to #reps (taller window)
-    height_in = max(6, min(20, 0.22 * reps))  # 0.22in per interval, capped
-    fig, ax = plt.subplots(figsize=(7, height_in))
-
-    colors = np.where(hit, "green", "red")
-    ax.hlines(y, lo, hi, colors=colors, linewidth=2)
-    ax.scatter(xbar, y, c=colors, s=18, zorder=3)
-
-    ax.axvline(true_mean, color="blue", ls="--")
-    ax.set_ylim(0, reps + 1)
-    ax.set_xlabel("Value")
-    ax.set_ylabel("Sample #")
-    cov_so_far = hit.mean() * 100 if k > 0 else 0.0
-    ax.set_title(f"{conf}% Confidence Intervals (n={n}, reps={reps})  |  Coverage so far: {cov_so_far:0.1f}%")
-    ax.grid(alpha=0.2, axis="x")
+@st.cache_data
+def coverage_surface(mean, sd, size, dataset_seed, ns, confs, reps, seed, engine="resample"):
+    """Empirical coverage over an (n, confidence) grid.
+
+    One set of samples per n (the draws compute_intervals makes for the same
+    seed); every confidence level reuses it, since only t* changes: an interval
+    covers μ exactly when |x̄ − μ| / SE ≤ t*. Cached on the population and grid
+    arguments, so every session asking for the same surface shares one result.
+    Returns an array of shape (len(ns), len(confs)) of coverage fractions.
+    """
+    pop = make_pop(mean, sd, size, dataset_seed)
+    mu = float(np.mean(pop))
+    confs = np.asarray(confs, dtype=float)
+    cov = np.empty((len(ns), confs.size))
+    for i, n in enumerate(ns):
+        rng = np.random.default_rng(seed)
+        xbar, se = _sample_stats(rng, pop, n, reps, COVERAGE_MEM_BUDGET, engine)
+        dev = np.abs(xbar - mu)
+        # s = 0 leaves the single point x̄, which covers μ only when x̄ == μ
+        ratio = np.divide(dev, se, out=np.where(dev == 0, 0.0, np.inf), where=se > 0)
+        t_stars = t.ppf(1 - (1 - confs/100)/2, df=n-1)
+        cov[i] = np.searchsorted(np.sort(ratio), t_stars, side="right") / reps
+    return cov
+
+@phase("build coverage surface plot")
+def plot_coverage_surface(cov, ns, confs, reps):
+    """Heatmap of empirical minus nominal coverage (percentage points)."""
+    confs = np.asarray(confs, dtype=float)
+    gap = cov * 100 - confs[None, :]
+    lim = max(1.0, float(np.abs(gap).max()))
+    fig, ax = plt.subplots(figsize=(8, 0.45 * len(ns) + 2))
+    im = ax.imshow(gap, cmap="RdBu", vmin=-lim, vmax=lim, aspect="auto", origin="lower")
+    ax.set_xticks(np.arange(confs.size), [f"{c:.0f}" for c in confs], fontsize=8)
+    ax.set_yticks(np.arange(len(ns)), [str(n) for n in ns])
+    ax.set_xlabel("Confidence level (%)")
+    ax.set_ylabel("Sample size (n)")
+    ax.set_title(f"Empirical − nominal coverage ({reps:,} intervals per cell)")
+    fig.colorbar(im, ax=ax, label="Percentage points")
     return fig
 
-def plot_normal_test(z_obs, alpha, tail):
-    x = np.linspace(-3.8, 3.8, 600)
-    y = norm.pdf(x)
+class IntervalAnimator:
+    """Incremental renderer for the coverage animation.
+
+    Holds one Agg canvas (7 MB at reps=30, 21 MB from reps=91), so build one
+    per script run rather than keeping it in session_state. advance(k) stamps
+    only the intervals drawn since the last call and repaints the title strip,
+    so a frame costs the same at k=300 as at k=1. image() returns the RGBA
+    buffer for st.image, at FIGURE_CACHE's 200 dpi so HiDPI screens stay sharp.
+    """
+
+    def __init__(self, data, conf, n, reps, dpi=200):
+        self.data, self.conf, self.n, self.reps = data, conf, n, reps
+        height_in = max(6, min(20, 0.22 * reps))  # 0.22in per interval, capped
+        self.fig = Figure(figsize=(7, height_in), dpi=dpi)
+        # fixed margins in inches (st.pyplot would have cropped with bbox_inches="tight")
+        self.fig.subplots_adjust(left=0.11, right=0.97, bottom=0.55 / height_in, top=1 - 0.45 / height_in)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.add_subplot()
+
+        # fixed limits over all reps, so the axes never rescale mid-animation
+        lo, hi = data["lo"][:reps], data["hi"][:reps]
+        pad = 0.05 * (hi.max() - lo.min())
+        ax.set_xlim(lo.min() - pad, hi.max() + pad)
+        ax.set_ylim(0, reps + 1)
+        ax.set_xlabel("Value")
+        ax.set_ylabel("Sample #")
+        ax.grid(alpha=0.2, axis="x")
+
+        # animated artists are skipped by canvas.draw() and stamped by hand
+        self._segs = LineCollection([], linewidths=2, animated=True)
+        ax.add_collection(self._segs)
+        self._pts = ax.scatter([], [], s=18, zorder=3, animated=True)
+        self._title = ax.set_title(" ", animated=True)
+        # the true-mean line sits above the intervals
+        self._mean_line = ax.axvline(data["true_mean"], color="blue", ls="--", animated=True)
+
+        self.canvas.draw()
+        strip = Bbox.from_extents(0, ax.bbox.y1 + 1, self.fig.bbox.x1, self.fig.bbox.y1)
+        self._title_bg = self.canvas.copy_from_bbox(strip)
+        self._k = 0
+
+    def _stamp(self, start, stop):
+        lo, hi = self.data["lo"][start:stop], self.data["hi"][start:stop]
+        xbar, hit = self.data["xbar"][start:stop], self.data["hit"][start:stop]
+        y = np.arange(start + 1, stop + 1)
+        colors = np.where(hit, "green", "red")
+        self._segs.set_segments(np.stack([np.column_stack([lo, y]), np.column_stack([hi, y])], axis=1))
+        self._segs.set_color(colors)
+        self._pts.set_offsets(np.column_stack([xbar, y]))
+        self._pts.set_color(colors)
+        self.ax.draw_artist(self._segs)
+        self.ax.draw_artist(self._pts)
+        self.ax.draw_artist(self._mean_line)
+
+    def advance(self, k):
+        """Bring the canvas to the first k intervals."""
+        k = int(min(max(k, 0), self.reps))
+        if k < self._k:  # rewound: repaint the static axes and start over
+            self.canvas.draw()
+            self._k = 0
+        if k > self._k:
+            self._stamp(self._k, k)
+            self._k = k
+
+        hit = self.data["hit"][:k]
+        cov_so_far = hit.mean() * 100 if k > 0 else 0.0
+        self.canvas.restore_region(self._title_bg)
+        self._title.set_text(f"{self.conf}% Confidence Intervals (n={self.n}, reps={self.reps})  |  Coverage so far: {cov_so_far:0.1f}%")
+        self.ax.draw_artist(self._title)
+        return self
+
+    def image(self):
+        return np.asarray(self.canvas.buffer_rgba())
+
+_COVERAGE_ANIMATION_HTML = Template("""
+<div style="font-family: sans-serif;">
+  <canvas id="cov" width="700" height="$height" style="width: 100%; max-width: 700px;"></canvas>
+  <div><button id="replay">Replay</button></div>
+</div>
+<script>
+const D = $payload;
+const cv = document.getElementById("cov"), g = cv.getContext("2d");
+const L = 60, R = 15, T = 30, B = 40, W = cv.width - L - R, H = cv.height - T - B;
+const sx = v => L + (v - D.xmin) / (D.xmax - D.xmin) * W;
+const sy = i => T + H - (i + 1) / (D.reps + 1) * H;
+let k = 0, timer = null;
+
+function axes() {
+  g.clearRect(0, 0, cv.width, cv.height);
+  g.strokeStyle = "#000"; g.lineWidth = 1; g.strokeRect(L, T, W, H);
+  g.fillStyle = "#000"; g.font = "11px sans-serif"; g.textAlign = "center";
+  for (const v of D.xticks) {
+    g.strokeStyle = "#eee"; g.beginPath(); g.moveTo(sx(v), T); g.lineTo(sx(v), T + H); g.stroke();
+    g.fillText(v, sx(v), T + H + 14);
+  }
+  g.fillText("Value", L + W / 2, T + H + 32);
+  g.textAlign = "right";
+  for (const i of D.yticks) g.fillText(i, L - 6, sy(i - 1) + 4);
+  g.strokeStyle = "blue"; g.setLineDash([6, 4]); g.beginPath();
+  g.moveTo(sx(D.mu), T); g.lineTo(sx(D.mu), T + H); g.stroke(); g.setLineDash([]);
+}
+
+function title() {
+  g.clearRect(0, 0, cv.width, T - 2);
+  let hits = 0; for (let i = 0; i < k; i++) hits += D.hit[i];
+  const cov = k ? (100 * hits / k).toFixed(1) : "0.0";
+  g.fillStyle = "#000"; g.font = "13px sans-serif"; g.textAlign = "center";
+  g.fillText(D.label + "  |  Coverage so far: " + cov + "%", cv.width / 2, 18);
+}
+
+function step() {
+  const i = k, c = D.hit[i] ? "green" : "red";
+  g.strokeStyle = c; g.fillStyle = c; g.lineWidth = 2;
+  g.beginPath(); g.moveTo(sx(D.lo[i]), sy(i)); g.lineTo(sx(D.hi[i]), sy(i)); g.stroke();
+  g.beginPath(); g.arc(sx(D.xbar[i]), sy(i), 3, 0, 2 * Math.PI); g.fill();
+  k += 1; title();
+  if (k >= D.reps) clearInterval(timer);
+}
+
+function play() { clearInterval(timer); k = 0; axes(); title(); timer = setInterval(step, D.ms); }
+document.getElementById("replay").onclick = play;
+play();
+</script>
+""")
+
+def coverage_animation_html(data, conf, n, reps, speed):
+    """Self-contained HTML/JS animation of the first `reps` intervals.
+
+    The whole animation ships to the browser in one message and plays there,
+    so the server does one compute and one send per Play instead of holding a
+    script thread for reps × speed seconds.
+    """
+    lo, hi = data["lo"][:reps], data["hi"][:reps]
+    pad = 0.05 * (hi.max() - lo.min())
+    xmin, xmax = float(lo.min() - pad), float(hi.max() + pad)
+    payload = dict(
+        lo=np.round(lo, 4).tolist(), hi=np.round(hi, 4).tolist(),
+        xbar=np.round(data["xbar"][:reps], 4).tolist(),
+        hit=data["hit"][:reps].astype(int).tolist(),
+        mu=data["true_mean"], reps=int(reps), xmin=xmin, xmax=xmax,
+        xticks=[float(v) for v in MaxNLocator(nbins=7).tick_values(xmin, xmax) if xmin <= v <= xmax],
+        yticks=[int(v) for v in MaxNLocator(nbins=6, integer=True).tick_values(1, reps) if 1 <= v <= reps],
+        ms=int(1000 * float(speed)),
+        label=f"{conf}% Confidence Intervals (n={n}, reps={reps})",
+    )
+    height = int(max(420, min(900, 3 * reps + 120)))
+    return _COVERAGE_ANIMATION_HTML.substitute(payload=json.dumps(payload), height=height), height + 40
+
+# alphas the pages offer (1-20 % sliders, 80-99 % confidence) plus the usual textbook ones
+COMMON_ALPHAS = tuple(np.round(np.r_[0.001, 0.005, np.arange(1, 21) / 100], 3))
+
+class CriticalValues:
+    """Upper-tail critical values of the standard normal and t distributions.
+
+    For every upper-tail probability p in {alpha, alpha/2 : alpha in COMMON_ALPHAS}
+    the exact quantiles are tabulated for integer df up to `max_df`. Fractional
+    (Welch) df and larger df are served by a cubic spline of log(quantile) in
+    1/df, anchored at the normal limit; measured against scipy on a dense df
+    grid over [1, 1e7] its relative error is below 2e-8. Other p go to scipy.
+    """
+
+    def __init__(self, alphas=COMMON_ALPHAS, max_df=1000):
+        self.probs = np.unique(np.round(np.r_[alphas, np.divide(alphas, 2)], 9))
+        self.max_df = max_df
+        self._col = {float(p): j for j, p in enumerate(self.probs)}
+        self._exact = self._spline = None
+        self._lock = threading.Lock()
+        self.exact = self.interpolated = self.misses = 0
+
+    def _build(self):
+        q = 1 - self.probs
+        # row 0 is the normal, row k is t with k df
+        exact = np.vstack([norm.ppf(q), t.ppf(q, np.arange(1, self.max_df + 1)[:, None])])
+        nodes = np.r_[np.arange(1, 2, 0.02), np.arange(2, 4, 0.05), np.arange(4, 30, 0.25),
+                      np.arange(30, 200, 1), np.arange(200, 1001, 5)][::-1]
+        logq = np.log(np.vstack([exact[0], t.ppf(q, nodes[:, None])]))
+        self._spline = CubicSpline(np.r_[0.0, 1 / nodes], logq, axis=0)
+        self._exact = exact
+
+    def upper(self, p, df=None):
+        """Point with upper-tail probability p under N(0,1) (df=None) or t(df)."""
+        if self._exact is None:
+            with self._lock:
+                if self._exact is None:
+                    self._build()
+        j = self._col.get(round(float(p), 9))
+        if j is not None and (df is None or df >= 1):
+            if df is None or (float(df).is_integer() and df <= self.max_df):
+                with self._lock:
+                    self.exact += 1
+                return float(self._exact[0 if df is None else int(df), j])
+            with self._lock:
+                self.interpolated += 1
+            return float(np.exp(self._spline(1 / float(df))[j]))
+        with self._lock:
+            self.misses += 1
+        return float(norm.ppf(1 - p) if df is None else t.ppf(1 - p, df))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.exact + self.interpolated + self.misses
+            return dict(exact=self.exact, interpolated=self.interpolated, misses=self.misses,
+                        hit_rate=(self.exact + self.interpolated) / lookups if lookups else 0.0)
+
+CRITICAL_VALUES = CriticalValues()
+
+def critical_value(alpha, tail="two", df=None):
+    """Rejection cutoff at level alpha for a z test (df=None) or a t test.
+
+    "right" is the upper alpha point, "left" its negative, and "two" the upper
+    alpha/2 point, i.e. the ± cutoff and the z*/t* multiplier of a CI.
+    """
+    if tail == "two":
+        return CRITICAL_VALUES.upper(alpha / 2, df)
+    c = CRITICAL_VALUES.upper(alpha, df)
+    return -c if tail == "left" else c
+
+@lru_cache(maxsize=4096)
+def _tail_prob(stat, tail, df):
+    if df is None:
+        cdf, sf = norm.cdf(stat), norm.sf(stat)
+    else:
+        cdf, sf = t.cdf(stat, df), t.sf(stat, df)
+    if tail == "right":
+        return float(sf)
+    if tail == "left":
+        return float(cdf)
+    return float(2 * min(cdf, sf))
+
+def tail_prob(stat, tail, df=None):
+    """p-value of `stat` for a right, left or two-tailed z (df=None) or t test."""
+    return _tail_prob(float(stat), tail, None if df is None else float(df))
+
+def critical_value_stats():
+    """Hit counts of the critical-value table and the p-value cache."""
+    info = _tail_prob.cache_info()
+    lookups = info.hits + info.misses
+    return dict(critical=CRITICAL_VALUES.stats(),
+                p_value=dict(hits=info.hits, misses=info.misses, entries=info.currsize,
+                             hit_rate=info.hits / lookups if lookups else 0.0))
+
+# reference curves for the test plots; grids are shared across pages and reruns
+class CurveGrid:
+    """Read-only x, pdf and cdf arrays of one reference distribution, as cached by curve_grid()."""
+
+    def __init__(self, x, pdf, cdf):
+        for arr in (x, pdf, cdf):
+            arr.setflags(write=False)
+        self.x, self.pdf, self.cdf = x, pdf, cdf
+
+    def region(self, a, b):
+        """(xx, yy) for fill_between over [a, b], clipped to the grid.
+
+        Grid points inside the interval are sliced out; the two endpoints are
+        interpolated so the shading starts exactly at a and ends at b.
+        """
+        x, pdf = self.x, self.pdf
+        a, b = max(a, x[0]), min(b, x[-1])
+        if not a < b:
+            return np.empty(0), np.empty(0)
+        i, j = np.searchsorted(x, a, side="right"), np.searchsorted(x, b, side="left")
+        xx = np.concatenate(([a], x[i:j], [b]))
+        yy = np.concatenate(([np.interp(a, x, pdf)], pdf[i:j], [np.interp(b, x, pdf)]))
+        return xx, yy
+
+@lru_cache(maxsize=256)
+def _curve_grid(df, lo, hi, num):
+    x = np.linspace(lo, hi, num)
+    dist = norm if df is None else t(df)
+    return CurveGrid(x, dist.pdf(x), dist.cdf(x))
+
+def curve_grid(df=None, lo=-4.0, hi=4.0, num=400):
+    """Cached CurveGrid for the standard normal (df=None) or t with `df` degrees of freedom.
+
+    Fractional (Welch) df are keyed to 2 decimals, the precision the pages show.
+    """
+    if df is not None:
+        df = int(df) if float(df).is_integer() else round(float(df), 2)
+    return _curve_grid(df, float(lo), float(hi), int(num))
+
+def _render_normal_test(z_obs, alpha, tail):
+    g = curve_grid(None, -3.8, 3.8, 600)
 
     fig, ax = plt.subplots()
-    ax.plot(x, y, label="Standard Normal PDF")
+    ax.plot(g.x, g.pdf, label="Standard Normal PDF")
 
     if tail == "right":
-        zcrit = norm.ppf(1 - alpha)
-        xx = np.linspace(zcrit, x.max(), 300)
-        ax.fill_between(xx, norm.pdf(xx), alpha=0.4, label=f"Rejection (z ≥ {zcrit:.2f})")
+        zcrit = critical_value(alpha, "right")
+        ax.fill_between(*g.region(zcrit, g.x[-1]), alpha=0.4, label=f"Rejection (z ≥ {zcrit:.2f})")
     elif tail == "left":
-        zcrit = norm.ppf(alpha)
-        xx = np.linspace(x.min(), zcrit, 300)
-        ax.fill_between(xx, norm.pdf(xx), alpha=0.4, label=f"Rejection (z ≤ {zcrit:.2f})")
+        zcrit = critical_value(alpha, "left")
+        ax.fill_between(*g.region(g.x[0], zcrit), alpha=0.4, label=f"Rejection (z ≤ {zcrit:.2f})")
     else:  # two
-        zcrit = norm.ppf(1 - alpha/2)
-        xx = np.linspace(zcrit, x.max(), 300)
-        ax.fill_between(xx, norm.pdf(xx), alpha=0.4, label=f"Rejection (|z| ≥ {zcrit:.2f})")
-        xx = np.linspace(x.min(), -zcrit, 300)
-        ax.fill_between(xx, norm.pdf(xx), alpha=0.4)
+        zcrit = critical_value(alpha, "two")
+        ax.fill_between(*g.region(zcrit, g.x[-1]), alpha=0.4, label=f"Rejection (|z| ≥ {zcrit:.2f})")
+        ax.fill_between(*g.region(g.x[0], -zcrit), alpha=0.4)
 
     ax.axvline(z_obs, color="green", linestyle="--", label=f"Observed z = {z_obs:.3f}")
     if tail == "two":
@@ -87,30 +598,24 @@ def plot_normal_test(z_obs, alpha, tail):
         "Normal model — Two tails"
     )
     ax.legend(loc="upper right", bbox_to_anchor=(1,1))
-    st.pyplot(fig)
+    return fig
 
-def plot_t_test(t_obs, alpha, tail, df):
-    alpha = float(alpha)
-    x = np.linspace(-4.5, 4.5, 700)
-    y = t.pdf(x, df)
+def _render_t_test(t_obs, alpha, tail, df):
+    g = curve_grid(df, -4.5, 4.5, 700)
 
     fig, ax = plt.subplots()
-    ax.plot(x, y, label=f"t PDF (df={df})")
+    ax.plot(g.x, g.pdf, label=f"t PDF (df={df})")
 
     if tail == "right":
-        tcrit = t.ppf(1 - alpha, df)
-        xx = np.linspace(tcrit, x.max(), 300)
-        ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, label=f"Rejection (t ≥ {tcrit:.2f})")
+        tcrit = critical_value(alpha, "right", df)
+        ax.fill_between(*g.region(tcrit, g.x[-1]), alpha=0.4, label=f"Rejection (t ≥ {tcrit:.2f})")
     elif tail == "left":
-        tcrit = t.ppf(alpha, df)
-        xx = np.linspace(x.min(), tcrit, 300)
-        ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, label=f"Rejection (t ≤ {tcrit:.2f})")
+        tcrit = critical_value(alpha, "left", df)
+        ax.fill_between(*g.region(g.x[0], tcrit), alpha=0.4, label=f"Rejection (t ≤ {tcrit:.2f})")
     else:  # two
-        tcrit = t.ppf(1 - alpha/2, df)
-        xx = np.linspace(tcrit, x.max(), 300)
-        ax.fill_between(xx, t.pdf(xx, df), alpha=0.4, label=f"Rejection (|t| ≥ {tcrit:.2f})")
-        xx = np.linspace(x.min(), -tcrit, 300)
-        ax.fill_between(xx, t.pdf(xx, df), alpha=0.4)
+        tcrit = critical_value(alpha, "two", df)
+        ax.fill_between(*g.region(tcrit, g.x[-1]), alpha=0.4, label=f"Rejection (|t| ≥ {tcrit:.2f})")
+        ax.fill_between(*g.region(g.x[0], -tcrit), alpha=0.4)
 
     ax.axvline(t_obs, color="green", linestyle="--", label=f"Observed t = {t_obs:.3f}")
     if tail == "two":
@@ -130,7 +635,71 @@ def plot_t_test(t_obs, alpha, tail, df):
         f"t model (df={df}) — Two tails"
     )
     ax.legend(loc="upper right")
-    st.pyplot(fig)
+    return fig
+
+class ImageCache:
+    """Thread-safe LRU of rendered PNGs, bounded by total bytes.
+
+    Lives at module level, so every session in the server process shares it.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+
+        # render outside the lock; a concurrent miss on the same key just renders twice
+        with phase("build cached figure"):
+            fig = render()
+        with phase("encode cached figure"):
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")  # st.pyplot's defaults
+        plt.close(fig)
+        png = buf.getvalue()
+
+        with self._lock:
+            if key not in self._items and len(png) <= self.max_bytes:
+                self._items[key] = png
+                self.bytes += len(png)
+                while self.bytes > self.max_bytes:
+                    _, old = self._items.popitem(last=False)
+                    self.bytes -= len(old)
+                    self.evictions += 1
+        return png
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(entries=len(self._items), bytes=self.bytes, max_bytes=self.max_bytes,
+                        hits=self.hits, misses=self.misses, evictions=self.evictions,
+                        hit_rate=self.hits / lookups if lookups else 0.0)
+
+# rendered test plots, keyed on the inputs rounded to what the plot can show
+FIGURE_CACHE = ImageCache(int(os.environ.get("MA206_FIGURE_CACHE_MB", 64)) * 2**20)
+
+def plot_normal_test(z_obs, alpha, tail):
+    z_obs, alpha = round(float(z_obs), 3), round(float(alpha), 4)
+    png = FIGURE_CACHE.get_or_render(("normal", z_obs, alpha, tail),
+                                     lambda: _render_normal_test(z_obs, alpha, tail))
+    st.image(png, width="stretch")
+
+def plot_t_test(t_obs, alpha, tail, df):
+    t_obs, alpha = round(float(t_obs), 3), round(float(alpha), 4)
+    df = int(df) if float(df).is_integer() else round(float(df), 2)
+    png = FIGURE_CACHE.get_or_render(("t", t_obs, alpha, tail, df),
+                                     lambda: _render_t_test(t_obs, alpha, tail, df))
+    st.image(png, width="stretch")
 
 def tail_choice(label_default="One-Sided (Right-Tailed, >)"):
     opt = st.radio(
@@ -145,8 +714,7 @@ def tail_choice(label_default="One-Sided (Right-Tailed, >)"):
 def wald_ci(X: int, n: int, conf: float):
     """Textbook Wald interval: phat ± z * sqrt(phat(1-phat)/n). Clip to [0,1]."""
     phat = X / n
-    alpha = 1 - conf / 100
-    z = norm.ppf(1 - alpha / 2)
+    z = critical_value(1 - conf / 100)
     se = math.sqrt(max(phat * (1 - phat) / n, 0.0))
     lo = max(0.0, phat - z * se)
     hi = min(1.0, phat + z * se)
@@ -155,8 +723,7 @@ def wald_ci(X: int, n: int, conf: float):
 def wilson_ci(X: int, n: int, conf: float):
     """Wilson score interval (without continuity correction)."""
     phat = X / n
-    alpha = 1 - conf / 100
-    z = norm.ppf(1 - alpha / 2)
+    z = critical_value(1 - conf / 100)
     denom = 1 + z**2 / n
     center = (phat + z**2 / (2 * n)) / denom
     half = (z * math.sqrt((phat * (1 - phat) / n) + (z**2 / (4 * n**2)))) / denom
@@ -165,8 +732,7 @@ def wilson_ci(X: int, n: int, conf: float):
 
 def agresti_coull_ci(X: int, n: int, conf: float):
     """Agresti–Coull interval using adjusted counts."""
-    alpha = 1 - conf / 100
-    z = norm.ppf(1 - alpha / 2)
+    z = critical_value(1 - conf / 100)
     n_tilde = n + z**2
     p_tilde = (X + z**2 / 2) / n_tilde
     se = math.sqrt(p_tilde * (1 - p_tilde) / n_tilde)
@@ -176,6 +742,11 @@ def agresti_coull_ci(X: int, n: int, conf: float):
 def clopper_pearson_ci(X: int, n: int, conf: float):
     """Exact (Clopper–Pearson) interval via Beta quantiles."""
     phat = X / n
+    whole = float(X).is_integer() and float(n).is_integer()
+    table = cp_table(conf) if whole and 1 <= n <= CP_TABLE_MAX_N and 0 <= X <= n else None
+    if table is not None:
+        i = _cp_index(int(X), int(n))
+        return phat, float(table[0, i]), float(table[1, i])
     alpha = 1 - conf / 100
     if X == 0:
         lo = 0.0
@@ -187,6 +758,107 @@ def clopper_pearson_ci(X: int, n: int, conf: float):
         hi = beta.ppf(1 - alpha / 2, X + 1, n - X)
     return phat, lo, hi
 
+# Array versions of the methods above: X, n and conf broadcast against each
+# other and (phat, lo, hi) come back as float arrays.
+def _z_star(conf):
+    return norm.ppf(1 - (1 - np.asarray(conf, dtype=float) / 100) / 2)
+
+def wald_ci_batch(X, n, conf):
+    """Vectorized wald_ci."""
+    X, n = np.asarray(X, dtype=float), np.asarray(n, dtype=float)
+    z = _z_star(conf)
+    phat = X / n
+    half = z * np.sqrt(np.maximum(phat * (1 - phat) / n, 0.0))
+    return phat, np.maximum(0.0, phat - half), np.minimum(1.0, phat + half)
+
+def wilson_ci_batch(X, n, conf):
+    """Vectorized wilson_ci."""
+    X, n = np.asarray(X, dtype=float), np.asarray(n, dtype=float)
+    z = _z_star(conf)
+    phat = X / n
+    denom = 1 + z**2 / n
+    center = (phat + z**2 / (2 * n)) / denom
+    half = z * np.sqrt(phat * (1 - phat) / n + z**2 / (4 * n**2)) / denom
+    return phat, np.maximum(0.0, center - half), np.minimum(1.0, center + half)
+
+def agresti_coull_ci_batch(X, n, conf):
+    """Vectorized agresti_coull_ci."""
+    X, n = np.asarray(X, dtype=float), np.asarray(n, dtype=float)
+    z = _z_star(conf)
+    n_tilde = n + z**2
+    p_tilde = (X + z**2 / 2) / n_tilde
+    half = z * np.sqrt(p_tilde * (1 - p_tilde) / n_tilde)
+    return X / n, np.maximum(0.0, p_tilde - half), np.minimum(1.0, p_tilde + half)
+
+def _cp_bounds(X, n, alpha):
+    # substitute valid Beta shapes at the edges, then overwrite those entries
+    lo = np.where(X == 0, 0.0, beta.ppf(alpha / 2, np.where(X == 0, 1, X), n - X + 1))
+    hi = np.where(X == n, 1.0, beta.ppf(1 - alpha / 2, X + 1, np.where(X == n, 1, n - X)))
+    return lo, hi
+
+def clopper_pearson_ci_batch(X, n, conf):
+    """Vectorized clopper_pearson_ci, with lo = 0 at X == 0 and hi = 1 at X == n."""
+    X, n = np.asarray(X, dtype=float), np.asarray(n, dtype=float)
+    table = cp_table(conf) if np.ndim(conf) == 0 else None
+    if table is not None:
+        ok = (n >= 1) & (n <= CP_TABLE_MAX_N) & (X >= 0) & (X <= n) & (X == np.floor(X)) & (n == np.floor(n))
+        if ok.all():
+            idx = _cp_index(X.astype(np.int64), n.astype(np.int64))
+            return X / n, table[0, idx], table[1, idx]
+    lo, hi = _cp_bounds(X, n, 1 - np.asarray(conf, dtype=float) / 100)
+    return X / n, lo, hi
+
+# Precomputed Clopper–Pearson bounds. One memory-mapped .npy per confidence
+# level holds (lo, hi) for every 0 ≤ X ≤ n ≤ CP_TABLE_MAX_N, so Streamlit
+# worker processes share the same page-cache pages instead of calling beta.ppf.
+# The files are written at deploy time (`python utils.py`, ~1 s and 8 MB per
+# level), never on a request; until a level exists, lookups use beta.ppf.
+CACHE_DIR = os.environ.get("MA206_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+CP_TABLE_MAX_N = int(os.environ.get("MA206_CP_MAX_N", 1000))
+CP_TABLE_CONFS = range(80, 100)
+_CP_TABLES = {}
+
+def _cp_index(X, n):
+    """Flat position of (X, n) in the triangular table (row n holds X = 0..n)."""
+    return n * (n + 1) // 2 + X
+
+def _build_cp_table(path, conf):
+    n = np.repeat(np.arange(CP_TABLE_MAX_N + 1), np.arange(1, CP_TABLE_MAX_N + 2))
+    X = np.arange(n.size) - _cp_index(0, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lo, hi = _cp_bounds(X.astype(float), n.astype(float), 1 - conf / 100)
+    table = np.stack([lo, hi])
+    table[:, 0] = np.nan  # n = 0 has no interval
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as fh:
+        np.save(fh, table)
+    os.replace(tmp, path)  # atomic, so concurrent builders never expose a partial file
+
+def _cp_table_path(conf):
+    return os.path.join(CACHE_DIR, f"clopper_pearson_n{CP_TABLE_MAX_N}_c{conf}.npy")
+
+def cp_table(conf):
+    """Memory-mapped (2, T) Clopper–Pearson table for an integer slider level once built, else None."""
+    if conf != int(conf) or int(conf) not in CP_TABLE_CONFS:
+        return None
+    conf = int(conf)
+    table = _CP_TABLES.get(conf)
+    if table is None:
+        try:
+            table = np.load(_cp_table_path(conf), mmap_mode="r")
+        except (OSError, ValueError):
+            return None  # not built yet, or unreadable: callers fall back to beta.ppf
+        _CP_TABLES[conf] = table
+    return table
+
+def build_cp_tables():
+    """Write the table of every slider level that is not on disk yet."""
+    for conf in CP_TABLE_CONFS:
+        path = _cp_table_path(conf)
+        if not os.path.exists(path):
+            _build_cp_table(path, conf)
+
 METHODS = {
     "Wald (textbook)": wald_ci,
     "Wilson (score)": wilson_ci,
@@ -194,8 +866,535 @@ METHODS = {
     "Clopper–Pearson (exact)": clopper_pearson_ci,
 }
 
+BATCH_METHODS = {
+    "Wald (textbook)": wald_ci_batch,
+    "Wilson (score)": wilson_ci_batch,
+    "Agresti–Coull": agresti_coull_ci_batch,
+    "Clopper–Pearson (exact)": clopper_pearson_ci_batch,
+}
+
+def _bounds_over_x(method, n, conf):
+    """(lo, hi) arrays over X = 0..n for one METHODS entry, evaluated in one pass."""
+    _, lo, hi = BATCH_METHODS[method](np.arange(n + 1), n, conf)
+    return lo, hi
+
+# (π, X) cells evaluated by exact_coverage's default grid: 2000 π points up
+# to n ≈ 500 (page 04's largest), fewer beyond so the cost stays near 0.05 s
+EXACT_COVERAGE_CELLS = 1_000_000
+
+@st.cache_data
+def exact_coverage(n, conf, grid_size=None, block=256):
+    """Exact coverage probability of every METHODS entry over a grid of true π.
+
+    Each method is evaluated once at every X = 0..n; coverage at π is then
+    Σₓ P(X = x | n, π) · [lo(x) ≤ π ≤ hi(x)], a binomial-weighted sum with no
+    Monte Carlo noise. π rows are processed `block` at a time to bound memory.
+    grid_size defaults to 2000 points, coarsened to EXACT_COVERAGE_CELLS / (n + 1)
+    (at least 200) for large n. Returns (pis, {method: coverage array}).
+    """
+    if grid_size is None:
+        grid_size = min(2000, max(200, EXACT_COVERAGE_CELLS // (n + 1)))
+    pis = np.linspace(0.0, 1.0, grid_size + 2)[1:-1]
+    X = np.arange(n + 1, dtype=float)
+    log_choose = gammaln(n + 1) - gammaln(X + 1) - gammaln(n - X + 1)
+    bounds = {name: _bounds_over_x(name, n, conf) for name in METHODS}
+    cov = {name: np.empty(pis.size) for name in METHODS}
+
+    for start in range(0, pis.size, block):
+        p = pis[start:start + block, None]
+        pmf = np.exp(log_choose + xlogy(X, p) + xlog1py(n - X, -p))
+        for name, (lo, hi) in bounds.items():
+            inside = (lo <= p) & (p <= hi)
+            cov[name][start:start + block] = np.einsum("ij,ij->i", pmf, inside)
+    return pis, cov
+
+@phase("build exact coverage plot")
+def plot_exact_coverage(pis, cov, n, conf):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    for name, c in cov.items():
+        ax.plot(pis, c, linewidth=1, label=name)
+    ax.axhline(conf / 100, color="black", ls="--", linewidth=1, label=f"Nominal {conf:.0f}%")
+    ax.set_xlim(0, 1)
+    ax.set_ylim(max(0.0, conf / 100 - 0.25), 1.0)
+    ax.set_xlabel("True proportion π")
+    ax.set_ylabel("Coverage probability")
+    ax.set_title(f"Exact coverage of {conf:.0f}% intervals (n={n})")
+    ax.grid(alpha=0.25)
+    ax.legend(loc="lower center", fontsize=8)
+    return fig
+
 # cached population maker
 @st.cache_data
 def make_pop(mean: float, sd: float, size: int, dataset_seed: int):
     rng = np.random.default_rng(dataset_seed)
     return rng.normal(mean, sd, size).astype(float)
+
+# --- repo datasets (see datastore.py) ---
+@st.cache_resource(show_spinner=False)
+def _dataset_moments(name, fingerprint):
+    return datastore.column_moments(datastore.open_dataset(name))
+
+def dataset_moments(name):
+    """{numeric column: Moments} for a repo dataset, built once per process and CSV version."""
+    return _dataset_moments(name, datastore.open_dataset(name).meta["fingerprint"])
+
+def dataset_column_picker(key, preferred=(("ranger_school", "ruck_min"), ("dataset_173", "m4_score"))):
+    """Dataset and numeric-column selectboxes; returns (dataset, column, Moments)."""
+    names = [n for n in datastore.list_datasets() if datastore.open_dataset(n).numeric_columns]
+    first = next(((d, c) for d, c in preferred if d in names), (names[0], None))
+    name = st.selectbox("Dataset", names, index=names.index(first[0]), key=f"{key}_dataset")
+    moments = dataset_moments(name)
+    cols = [c for c, m in moments.items() if m.n >= 2]
+    default = cols.index(first[1]) if name == first[0] and first[1] in cols else 0
+    column = st.selectbox("Column", cols, index=default, key=f"{key}_column_{name}")
+    return name, column, moments[column]
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _column_values(name, fingerprint, column):
+    x = np.asarray(datastore.open_dataset(name).column(column), dtype=float)
+    values = x[~np.isnan(x)]
+    values.setflags(write=False)
+    return values
+
+def column_values(name, column):
+    """Read-only non-missing values of a numeric column."""
+    return _column_values(name, datastore.open_dataset(name).meta["fingerprint"], column)
+
+@st.cache_resource(show_spinner=False)
+def _group_index(name, fingerprint):
+    return datastore.group_index(datastore.open_dataset(name))
+
+def group_index(name):
+    """{(group column, numeric column): {level: Moments}} for a repo dataset, built once per CSV version."""
+    return _group_index(name, datastore.open_dataset(name).meta["fingerprint"])
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _group_values(name, fingerprint, by, column, levels):
+    ds = datastore.open_dataset(name)
+    codes, labels = datastore.group_codes(ds, by)
+    x = np.asarray(ds.column(column), dtype=float)
+    keep = np.isin(codes, [labels.index(v) for v in levels]) & ~np.isnan(x)
+    values = x[keep]
+    values.setflags(write=False)
+    return values
+
+def group_values(name, by, column, levels):
+    """Read-only raw values of `column` for the rows whose `by` is one of `levels`."""
+    return _group_values(name, datastore.open_dataset(name).meta["fingerprint"], by, column, tuple(levels))
+
+def two_group_picker(key, preferred=(("wcgs", "chd", "chol"), ("penguins", "species", "body_mass_g")),
+                     with_values=False):
+    """Dataset, grouping, numeric column and the levels pooled into each group.
+
+    Returns ((label1, Moments1), (label2, Moments2)), or None after a warning if a
+    group is too small or the two share a level. Pooled levels are merged from the
+    per-level moments, so no rows are rescanned. with_values=True appends each
+    group's raw values (group_values) to its tuple, for the randomization tests.
+    """
+    names = [n for n in datastore.list_datasets()
+             if datastore.open_dataset(n).numeric_columns and datastore.group_columns(datastore.open_dataset(n))]
+    first = next((p for p in preferred if p[0] in names), (names[0], None, None))
+    name = st.selectbox("Dataset", names, index=names.index(first[0]), key=f"{key}_dataset")
+    if name != first[0]:
+        first = (name, None, None)
+    ds = datastore.open_dataset(name)
+    bys = datastore.group_columns(ds)
+    by = st.selectbox("Group by", bys, index=bys.index(first[1]) if first[1] in bys else 0,
+                      key=f"{key}_by_{name}")
+    cols = [c for c in ds.numeric_columns if c != by]
+    column = st.selectbox("Measurement", cols, index=cols.index(first[2]) if first[2] in cols else 0,
+                          key=f"{key}_column_{name}")
+    per_level = group_index(name)[by, column]
+    levels = list(per_level)
+    g1 = st.multiselect("Group 1 levels", levels, default=levels[:1], key=f"{key}_g1_{name}_{by}")
+    g2 = st.multiselect("Group 2 levels", levels, default=levels[1:2], key=f"{key}_g2_{name}_{by}")
+    if set(g1) & set(g2):
+        st.warning("A level can only be in one group.")
+        return None
+    m1 = datastore.Moments.combine(per_level[g] for g in g1)
+    m2 = datastore.Moments.combine(per_level[g] for g in g2)
+    if m1.n < 2 or m2.n < 2:
+        st.warning("Each group needs at least two observations.")
+        return None
+    label1, label2 = (f"{by} = " + " or ".join(g) for g in (g1, g2))
+    st.caption(f"`{name}.csv` › {column}: group 1 ({label1}) n = {m1.n}, x̄ = {m1.mean:.3f}, s = {m1.sd:.3f}; "
+               f"group 2 ({label2}) n = {m2.n}, x̄ = {m2.mean:.3f}, s = {m2.sd:.3f}")
+    if with_values:
+        return (label1, m1, group_values(name, by, column, g1)), (label2, m2, group_values(name, by, column, g2))
+    return (label1, m1), (label2, m2)
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+def _count_cube(name, fingerprint, cols):
+    cube = datastore.count_cube(datastore.open_dataset(name), cols)
+    cube.setflags(write=False)
+    return cube
+
+def count_cube(name, cols):
+    """Cached datastore.count_cube; permutations of the same columns share one cube (a transposed view)."""
+    ds = datastore.open_dataset(name)
+    order = sorted(cols, key=ds.columns.index)
+    cube = _count_cube(name, ds.meta["fingerprint"], tuple(order))
+    return cube.transpose([order.index(c) for c in cols])
+
+def two_proportion_picker(key, preferred=("gallen", "in_out", "Inside", "stand", "pitch_type", "FF")):
+    """Dataset, outcome, comparison and optional filter for a two-proportion question.
+
+    Returns ((label1, X1, n1), (label2, X2, n2)) from slices of a cached count
+    cube, or None after a warning if the selection is empty or overlapping.
+    Rows missing the outcome or the comparison column are left out of n.
+    """
+    names = [n for n in datastore.list_datasets() if len(datastore.group_columns(datastore.open_dataset(n))) >= 2]
+    d0, out0, succ0, by0, filt0, keep0 = preferred if preferred[0] in names else (names[0],) + (None,) * 5
+    name = st.selectbox("Dataset", names, index=names.index(d0), key=f"{key}_dataset")
+    if name != d0:
+        out0 = succ0 = by0 = filt0 = keep0 = None
+    ds = datastore.open_dataset(name)
+    cols = datastore.group_columns(ds)
+    pick = lambda options, value: options.index(value) if value in options else 0
+
+    outcome = st.selectbox("Outcome", cols, index=pick(cols, out0), key=f"{key}_outcome_{name}")
+    out_levels = datastore.group_codes(ds, outcome)[1]
+    success = st.multiselect("Counts as a success", out_levels, default=[out_levels[pick(out_levels, succ0)]],
+                             key=f"{key}_success_{name}_{outcome}")
+    by_cols = [c for c in cols if c != outcome]
+    by = st.selectbox("Compare groups of", by_cols, index=pick(by_cols, by0), key=f"{key}_by_{name}_{outcome}")
+    by_levels = datastore.group_codes(ds, by)[1]
+    g1 = st.multiselect("Group 1 levels", by_levels, default=by_levels[:1], key=f"{key}_g1_{name}_{by}")
+    g2 = st.multiselect("Group 2 levels", by_levels, default=by_levels[1:2], key=f"{key}_g2_{name}_{by}")
+    filt_cols = ["(no filter)"] + [c for c in cols if c not in (outcome, by)]
+    filt = st.selectbox("Only rows where", filt_cols, index=pick(filt_cols, filt0), key=f"{key}_filter_{name}")
+
+    if filt == "(no filter)":
+        table, where = count_cube(name, (by, outcome)), ""
+    else:
+        f_levels = datastore.group_codes(ds, filt)[1]
+        keep = st.multiselect(f"{filt} is one of", f_levels, default=[f_levels[pick(f_levels, keep0)]],
+                              key=f"{key}_keep_{name}_{filt}")
+        cube = count_cube(name, (filt, by, outcome))
+        table = cube[[f_levels.index(v) for v in keep]].sum(axis=0)
+        where = f", {filt} = " + " or ".join(keep)
+
+    if set(g1) & set(g2):
+        st.warning("A level can only be in one group.")
+        return None
+    s_idx = [out_levels.index(v) for v in success]
+    groups = []
+    for g in (g1, g2):
+        rows = table[[by_levels.index(v) for v in g]]
+        groups.append((f"{by} = " + " or ".join(g), int(rows[:, s_idx].sum()), int(rows[:, :-1].sum())))
+    if any(n == 0 for _, _, n in groups):
+        st.warning("Each group needs at least one row.")
+        return None
+    (l1, x1, n1), (l2, x2, n2) = groups
+    st.caption(f"`{name}.csv`{where} › {outcome} = {' or '.join(success) or '(nothing)'}: "
+               f"group 1 ({l1}) {x1}/{n1}; group 2 ({l2}) {x2}/{n2}")
+    return groups[0], groups[1]
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _bitmap_index(name, fingerprint):
+    return datastore.BitmapIndex(datastore.open_dataset(name))
+
+def bitmap_index(name):
+    """Shared datastore.BitmapIndex for a dataset, rebuilt when its CSV changes."""
+    return _bitmap_index(name, datastore.open_dataset(name).meta["fingerprint"])
+
+def proportion_picker(key, preferred=("nhanes", "SmokeNow", "Yes", {"AgeDecade": [" 30-39"], "Gender": ["female"]})):
+    """Dataset, outcome and filters for a one-proportion question.
+
+    Filters AND across columns and OR within a column. Returns (X, n) counted
+    from the dataset's bitmap index, or None after a warning if no rows match.
+    Rows missing the outcome are left out of n.
+    """
+    names = [n for n in datastore.list_datasets() if datastore.group_columns(datastore.open_dataset(n))]
+    d0, out0, succ0, where0 = preferred if preferred[0] in names else (names[0], None, None, {})
+    name = st.selectbox("Dataset", names, index=names.index(d0), key=f"{key}_dataset")
+    if name != d0:
+        out0, succ0, where0 = None, None, {}
+    index = bitmap_index(name)
+    cols = list(index.labels)
+
+    outcome = st.selectbox("Outcome", cols, index=cols.index(out0) if out0 in cols else 0, key=f"{key}_outcome_{name}")
+    levels = index.labels[outcome]
+    success = st.multiselect("Counts as a success", levels, default=[succ0 if succ0 in levels else levels[0]],
+                             key=f"{key}_success_{name}_{outcome}")
+    filt_cols = [c for c in cols if c != outcome]
+    filters = st.multiselect("Only rows where", filt_cols, default=[c for c in where0 if c in filt_cols],
+                             key=f"{key}_filters_{name}_{outcome}")
+    where = {}
+    for col in filters:
+        where[col] = st.multiselect(f"{col} is one of", index.labels[col], default=where0.get(col, index.labels[col][:1]),
+                                    key=f"{key}_where_{name}_{col}")
+
+    rows = index.select({**where, outcome: None})
+    n = index.count(bits=rows)
+    X = index.count(bits=rows & index.rows(outcome, success))
+    if n == 0:
+        st.warning("No rows match these filters.")
+        return None
+    clauses = [f"{col} = " + " or ".join(v.strip() for v in lv) for col, lv in where.items()]
+    st.caption(f"`{name}.csv`" + (", " + ", ".join(clauses) if clauses else "")
+               + f" › {outcome} = {' or '.join(success) or '(nothing)'}: {X}/{n}")
+    return X, n
+
+# one-row-per-pair datasets and their default (first, second) measurement columns
+PAIRED_DATASETS = {
+    "sled_times_paired": ("sled_S", "sled_G"),
+    "twin_recall": ("Memory_Recall_Twin_A", "Memory_Recall_Twin_B"),
+    "plebe_wide": ("csm_yes", "csm_no"),
+    "sami_wide": ("metal", "classical"),
+    "spider1": ("mantis", "no_mantis"),
+}
+
+class PairedDifferences:
+    """Differences first − second over a dataset's complete pairs (a frozen array) and their Moments."""
+
+    def __init__(self, name, fingerprint, first, second, d):
+        d.setflags(write=False)
+        self.name, self.fingerprint, self.first, self.second, self.d = name, fingerprint, first, second, d
+        self.moments = datastore.Moments.of(d)
+
+    @property
+    def label(self):
+        return f"{self.first} − {self.second}"
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _paired_differences(name, fingerprint, first, second):
+    ds = datastore.open_dataset(name)
+    x = np.asarray(ds.column(first), dtype=float)
+    y = np.asarray(ds.column(second), dtype=float)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    return PairedDifferences(name, fingerprint, first, second, x[ok] - y[ok])
+
+def paired_differences(name, first, second):
+    """Cached PairedDifferences for two numeric columns of a dataset."""
+    return _paired_differences(name, datastore.open_dataset(name).meta["fingerprint"], first, second)
+
+def paired_picker(key):
+    """Dataset and two measurement columns for paired data.
+
+    Returns a PairedDifferences, or None after a warning if the columns are
+    the same or there are fewer than two complete pairs.
+    """
+    names = [n for n in PAIRED_DATASETS if os.path.exists(os.path.join(datastore.DATA_DIR, f"{n}.csv"))]
+    name = st.selectbox("Dataset", names, key=f"{key}_dataset")
+    cols = datastore.open_dataset(name).numeric_columns
+    first0, second0 = PAIRED_DATASETS[name]
+    first = st.selectbox("First measurement", cols, index=cols.index(first0), key=f"{key}_first_{name}")
+    second = st.selectbox("Second measurement", cols, index=cols.index(second0), key=f"{key}_second_{name}")
+    if first == second:
+        st.warning("Pick two different columns.")
+        return None
+    paired = paired_differences(name, first, second)
+    if paired.moments.n < 2:
+        st.warning("Need at least two complete pairs.")
+        return None
+    st.caption(f"`{name}.csv` › d = {paired.label}, {paired.moments.n} pairs")
+    return paired
+
+def _render_differences(paired):
+    d, m = paired.d, paired.moments
+    fig, ax = plt.subplots(figsize=(6, 2.4))
+    ax.hist(d, bins="auto", color="tab:blue", alpha=0.7, edgecolor="white")
+    ax.axvline(m.mean, color="tab:red", label=f"d̄ = {m.mean:.3f}")
+    ax.axvline(0, color="black", linestyle="--", alpha=0.7)
+    ax.set_xlabel(f"Difference ({paired.label})")
+    ax.set_ylabel("Pairs")
+    ax.set_title(f"{m.n} paired differences from {paired.name}.csv")
+    ax.legend(loc="upper right")
+    return fig
+
+def plot_differences(paired):
+    """Histogram of a PairedDifferences, rendered once per dataset version and column pair."""
+    png = FIGURE_CACHE.get_or_render(("paired", paired.name, paired.fingerprint, paired.first, paired.second),
+                                     lambda: _render_differences(paired))
+    st.image(png, width="stretch")
+
+def _render_null(null, observed, tail, xlabel, title):
+    fig, ax = plt.subplots(figsize=(6, 2.6))
+    ax.hist(null, bins=60, color="tab:gray", alpha=0.7)
+    ax.axvline(observed, color="green", linestyle="--", label=f"Observed = {observed:.3f}")
+    if tail == "two":
+        ax.axvline(-observed, color="green", linestyle="--")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Simulations")
+    ax.set_title(title)
+    ax.legend(loc="upper right")
+    return fig
+
+def permutation_panel(x, y, tail, alpha, key):
+    """Permutation test of μ₁ = μ₂ on the raw values of both groups, run when the button is pressed."""
+    c1, c2 = st.columns(2)
+    max_perms = c1.select_slider("Most permutations", [10_000, 100_000, 1_000_000], value=100_000, key=f"{key}_perms")
+    seed = c2.number_input("Seed", min_value=0, value=206, step=1, key=f"{key}_perm_seed")
+    if not st.button("Run permutation test", key=f"{key}_perm_run"):
+        return None
+    t0 = time.perf_counter()
+    with phase("permutation test"):
+        res = simulation.permutation_test(x, y, tail, alpha, max_perms, seed=int(seed))
+    elapsed = time.perf_counter() - t0
+    lo, hi = res.band
+    st.write(f"Observed $\\bar x_1 - \\bar x_2 = {res.observed:.3f}$. Permutation p-value ≈ **{res.p_value:.4f}** "
+             f"(99% Monte Carlo band {lo:.4f} to {hi:.4f}).")
+    st.caption(f"{res.draws:,} permutations in {elapsed:.2f} s"
+               + (" — stopped early: the band is clear of α." if res.stopped_early else "."))
+    pyplot(_render_null(res.null, res.observed, tail, "Permuted x̄₁ − x̄₂",
+                        "Differences in means with the group labels shuffled"))
+    return res
+
+def _render_count_null(hist, to_stat, observed, extreme, xlabel, title):
+    # one filled step curve over the values that occurred (a few artists however
+    # wide the support), with the extreme counts (mask over hist.values) in red
+    nz = np.flatnonzero(hist.counts)
+    lo, hi = (nz[0], nz[-1] + 1) if nz.size else (0, hist.counts.size)
+    v, counts, extreme = hist.values[lo:hi], hist.counts[lo:hi], extreme[lo:hi]
+    edges = to_stat(np.append(v, v[-1] + 1) - 0.5)
+    fig, ax = plt.subplots(figsize=(6, 2.6))
+    ax.stairs(counts, edges, fill=True, color="tab:gray", alpha=0.7)
+    ax.stairs(np.where(extreme, counts, 0), edges, fill=True, color="tab:red", alpha=0.8)
+    ax.axvline(to_stat(observed), color="green", linestyle="--", label=f"Observed = {to_stat(observed):.3f}")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Simulations")
+    ax.set_title(title)
+    ax.legend(loc="upper right")
+    return fig
+
+def two_proportion_simulation_panel(x1, n1, x2, n2, tail, z_pval, key):
+    """Simulated p̂₁ − p̂₂ under π₁ = π₂ from hypergeometric draws; Fisher's exact p-value is the target."""
+    x1, n1, x2, n2 = int(x1), int(n1), int(x2), int(n2)
+    if not (0 <= x1 <= n1 and 0 <= x2 <= n2):
+        st.warning("Successes must be between 0 and the sample size in each group.")
+        return None
+    c1, c2 = st.columns(2)
+    draws = c1.select_slider("Simulated tables", [100_000, 1_000_000, 10_000_000], value=1_000_000, key=f"{key}_draws")
+    seed = c2.number_input("Seed", min_value=0, value=206, step=1, key=f"{key}_sim_seed")
+    fisher = simulation.fisher_exact(x1, n1, x2, n2, tail)
+    if not st.button("Simulate the null", key=f"{key}_sim_run"):
+        st.caption(f"Z-test p-value {z_pval:.4f}; exact (Fisher) p-value {fisher:.4f}.")
+        return None
+
+    k = x1 + x2
+    extreme = simulation.fisher_extreme(x1, n1, x2, n2, tail)
+    to_stat = lambda v: np.asarray(v) / n1 - (k - np.asarray(v)) / n2  # p̂₁ − p̂₂
+    placeholder = st.empty()
+    t0 = time.perf_counter()
+    for hist in simulation.hypergeometric_null(n1, n2, k, int(draws), seed=int(seed),
+                                               batch=max(int(draws) // 10, 100_000)):
+        with phase("simulate two-proportion null"):
+            p_sim = hist.p_value_where(extreme)
+            fig = _render_count_null(hist, to_stat, x1, extreme, "Simulated p̂₁ − p̂₂",
+                                     "Differences in proportions with the group labels shuffled")
+        with placeholder.container():
+            st.write(f"Simulated p-value ≈ **{p_sim:.4f}** after {hist.total:,} tables  |  "
+                     f"Z-test {z_pval:.4f}  |  exact (Fisher) {fisher:.4f}")
+            pyplot(fig)
+    st.caption(f"{hist.total:,} hypergeometric draws in {time.perf_counter() - t0:.2f} s, "
+               "kept only as counts per possible value of X₁.")
+    return p_sim
+
+def sign_flip_panel(paired, mu0, tail, alpha, key):
+    """Sign-flip test of μ_d = mu0: every sign pattern for small n, random patterns otherwise."""
+    n = paired.moments.n
+    seed = st.number_input("Seed", min_value=0, value=206, step=1, key=f"{key}_flip_seed",
+                           help="Used only when there are too many sign patterns to list and random ones are drawn.")
+    if not st.button("Run sign-flip test", key=f"{key}_flip_run"):
+        return None
+    t0 = time.perf_counter()
+    with phase("sign-flip test"):
+        res = simulation.sign_flip_test(paired.d, mu0, tail, alpha, seed=int(seed))
+    elapsed = time.perf_counter() - t0
+    if res.exact:
+        st.caption(f"With n = {n} pairs all 2^{n} = {2 ** n:,} sign patterns are enumerated exactly.")
+        st.write(f"Observed $\\bar d - \\mu_{{d,0}} = {res.observed:.3f}$. Exact sign-flip p-value = **{res.p_value:.4f}**.")
+    else:
+        st.caption(f"2^{n} sign patterns are too many to list, so random patterns are drawn instead.")
+        lo, hi = res.band
+        st.write(f"Observed $\\bar d - \\mu_{{d,0}} = {res.observed:.3f}$. Sign-flip p-value ≈ **{res.p_value:.4f}** "
+                 f"(99% Monte Carlo band {lo:.4f} to {hi:.4f}).")
+    st.caption(f"{res.draws:,} sign patterns in {elapsed:.2f} s"
+               + (" — stopped early: the band is clear of α." if res.stopped_early else "."))
+    with phase("build plot: sign-flip null"):
+        fig, ax = plt.subplots(figsize=(6, 2.6))
+        ax.stairs(res.counts, res.edges, fill=True, color="tab:gray", alpha=0.7)
+        ax.axvline(res.observed, color="green", linestyle="--", label=f"Observed = {res.observed:.3f}")
+        if tail == "two":
+            ax.axvline(-res.observed, color="green", linestyle="--")
+        ax.set_xlabel("d̄ − μ_d₀ with random signs")
+        ax.set_ylabel("Sign patterns")
+        ax.set_title("Mean difference when each pair's order is a coin flip")
+        ax.legend(loc="upper right")
+    pyplot(fig)
+    return res
+
+def bootstrap_panel(samples, conf, t_interval, key, xlabel):
+    """Table of percentile, basic and BCa bootstrap intervals for `samples`, with the t interval for comparison."""
+    c1, c2 = st.columns(2)
+    reps = c1.select_slider("Bootstrap resamples", [10_000, 50_000, 200_000], value=50_000, key=f"{key}_boot_reps")
+    seed = c2.number_input("Seed", min_value=0, value=206, step=1, key=f"{key}_boot_seed")
+    pool = st.checkbox("Spread the resamples over every CPU core", value=False, key=f"{key}_boot_pool")
+    if not st.button("Run bootstrap", key=f"{key}_boot_run"):
+        return None
+    t0 = time.perf_counter()
+    with phase("bootstrap"):
+        res = simulation.bootstrap_ci(samples, conf, int(reps), seed=int(seed),
+                                      workers=os.cpu_count() if pool else None)
+    elapsed = time.perf_counter() - t0
+    rows = [("t (formula)", t_interval), ("Percentile", res.percentile), ("Basic", res.basic), ("BCa", res.bca)]
+    st.markdown(f"| Method | {conf}% interval |\n|---|---|\n"
+                + "\n".join(f"| {label} | ({lo:.3f}, {hi:.3f}) |" for label, (lo, hi) in rows))
+    st.caption(f"{res.reps:,} resamples in {elapsed:.2f} s; BCa bias z₀ = {res.bias:.3f}, acceleration a = {res.accel:.4f}.")
+    with phase("build plot: bootstrap distribution"):
+        fig, ax = plt.subplots(figsize=(6, 2.6))
+        ax.hist(res.stats, bins=60, color="tab:gray", alpha=0.7)
+        ax.axvline(res.estimate, color="tab:blue", label=f"Estimate = {res.estimate:.3f}")
+        for x in res.percentile:
+            ax.axvline(x, color="tab:red", linestyle="--")
+        for x in res.bca:
+            ax.axvline(x, color="tab:purple", linestyle=":")
+        ax.plot([], [], color="tab:red", linestyle="--", label="Percentile")
+        ax.plot([], [], color="tab:purple", linestyle=":", label="BCa")
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Resamples")
+        ax.set_title("Bootstrap distribution")
+        ax.legend(loc="upper right")
+    pyplot(fig)
+    return res
+
+def one_proportion_simulation_panel(X, n, p0, tail, z_pval, key):
+    """Histogram of binomial counts under π = p0 that fills in batch by batch; returns the simulated p-value."""
+    X, n, p0 = int(X), int(n), float(p0)
+    if not 0 <= X <= n:
+        st.warning("Successes must be between 0 and the sample size.")
+        return None
+    c1, c2 = st.columns(2)
+    draws = c1.select_slider("Simulated samples", [100_000, 1_000_000, 10_000_000, 100_000_000], value=1_000_000,
+                             key=f"{key}_draws")
+    seed = c2.number_input("Seed", min_value=0, value=206, step=1, key=f"{key}_sim_seed")
+    extreme = simulation.binomial_extreme(X, n, p0, tail)
+    exact = simulation.binomial_exact(X, n, p0, tail)
+    if not st.button("Simulate the null", key=f"{key}_sim_run"):
+        st.caption(f"Z-test p-value {z_pval:.4f}; exact binomial p-value {exact:.4f}.")
+        return None
+
+    placeholder = st.empty()
+    t0 = time.perf_counter()
+    # batches stay at COUNT_BATCH draws; the display refreshes about ten times
+    step = max(int(draws) // 10, 100_000)
+    refresh = step
+    for hist in simulation.binomial_null(n, p0, int(draws), seed=int(seed), batch=min(step, simulation.COUNT_BATCH)):
+        if hist.total < min(refresh, int(draws)):
+            continue
+        refresh += step
+        with phase("simulate one-proportion null"):
+            p_sim = hist.p_value_where(extreme)
+            fig = _render_count_null(hist, lambda v: np.asarray(v) / n, X, extreme, "Simulated p̂",
+                                     f"Sample proportions from n = {n} draws with π₀ = {p0:g}")
+        with placeholder.container():
+            st.write(f"Simulated p-value ≈ **{p_sim:.4f}** after {hist.total:,} samples  |  "
+                     f"Z-test {z_pval:.4f}  |  exact binomial {exact:.4f}")
+            pyplot(fig)
+    st.caption(f"{hist.total:,} binomial draws in {time.perf_counter() - t0:.2f} s, "
+               f"kept only as {hist.counts.size:,} counts (one per possible X).")
+    return p_sim
+
+if __name__ == "__main__":
+    build_cp_tables()